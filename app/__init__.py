@@ -0,0 +1,21 @@
+# === Lazy Router Registry (PEP 562) ===
+# Routers pull in the OpenAI, Airtable and PDF code; each is imported on first attribute
+# access (e.g. `from app import quote_router`) instead of whenever the package loads.
+
+import importlib
+
+_ROUTERS = {
+    "quote_router": "app.api.quote",
+    "filter_response_router": "app.api.filter_response",
+    "store_customer_router": "app.store_customer",
+    "auto_fixer_router": "app.auto_fixer",
+}
+
+
+def __getattr__(name):
+    module_name = _ROUTERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    router = importlib.import_module(module_name).router
+    globals()[name] = router  # cached — later lookups skip __getattr__
+    return router
@@ -1,7 +1,7 @@
 # === Airtable Field Rules ===
 
 # Master List of Valid Airtable Fields (Allowed for Read/Write)
-VALID_AIRTABLE_FIELDS = {
+VALID_AIRTABLE_FIELDS = frozenset({
     # Core Quote Identifiers
     "quote_id", "timestamp", "source", "session_id", "quote_stage", "quote_notes", "privacy_acknowledged",
 
@@ -35,22 +35,22 @@ VALID_AIRTABLE_FIELDS = {
 
     # Traceability
     "message_log", "gpt_error_log", "debug_log"  # ✅ Added debug_log here
-}
+})
 
 # === Field Mapping ===
 FIELD_MAP = {k: k for k in VALID_AIRTABLE_FIELDS}
 
 # === Integer-only Fields ===
-INTEGER_FIELDS = {
+INTEGER_FIELDS = frozenset({
     "bedrooms_v2", "bathrooms_v2", "window_count",
     "carpet_bedroom_count", "carpet_mainroom_count", "carpet_study_count",
     "carpet_halway_count", "carpet_stairs_count", "carpet_other_count",
     "special_request_minutes_min", "special_request_minutes_max",
     "number_of_sessions"
-}
+})
 
 # === Boolean-only Fields (must normalize to True/False) ===
-BOOLEAN_FIELDS = {
+BOOLEAN_FIELDS = frozenset({
     "oven_cleaning",
     "window_cleaning",
     "blind_cleaning",
@@ -66,15 +66,15 @@ BOOLEAN_FIELDS = {
     "mandurah_property",
     "is_property_manager",
     "privacy_acknowledged"
-}
+})
 
 # === Single Select Fields (expected exact string values) ===
-SINGLE_SELECT_FIELDS = {
+SINGLE_SELECT_FIELDS = frozenset({
     "carpet_cleaning"  # Allowed: "Yes", "No", or ""
-}
+})
 
 # === Truthy Strings for Boolean Normalization ===
-TRUE_VALUES = {"yes", "true", "1", "y", "sure", "correct"}
+TRUE_VALUES = frozenset({"yes", "true", "1", "y", "sure", "correct"})
 
 # === Max Reasonable Integer Value for Safety Clamps ===
 MAX_REASONABLE_INT = 1000
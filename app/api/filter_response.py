@@ -12,10 +12,12 @@ import time
 import traceback  # ✅ required for error reporting
 from time import sleep
 from datetime import datetime, timedelta
-from email.mime.text import MIMEText
+from email.message import EmailMessage
+from email.policy import SMTP as SMTP_POLICY
 from urllib.parse import quote
 
 # === Third-Party Modules ===
+import orjson
 import pytz
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import JSONResponse
@@ -28,33 +30,59 @@ from app.config import LOG_TRUNCATE_LENGTH, MAX_LOG_LENGTH, PDF_SYSTEM_MESSAGE,
 from app.models.quote_models import QuoteRequest
 
 # === Services ===
+from app.services.airtable_client import session, airtable_breaker, AIRTABLE_API_URL, AIRTABLE_TIMEOUT
 from app.services.email_sender import send_quote_email
-from app.services.pdf_generator import generate_quote_pdf
 from app.services.quote_logic import calculate_quote, should_calculate_quote
 from app.services.quote_id_utils import get_next_quote_id
 
 # === Field Rules and Logging ===
 from app.api.field_rules import FIELD_MAP, VALID_AIRTABLE_FIELDS, INTEGER_FIELDS, BOOLEAN_FIELDS
-from app.utils.logging_utils import log_debug_event, flush_debug_log
+from app.utils.logging_utils import log_debug_event, flush_debug_log, queue_quote_update, LOG_FIELDS
 
-# === OpenAI Client Setup ===
-from openai import OpenAI
+# === OpenAI Client Setup (client built on first GPT call) ===
+from app.services.openai_client import get_openai_client
 
-if not os.getenv("OPENAI_API_KEY"):
+if not settings.OPENAI_API_KEY:
     logger.error("❌ Missing OPENAI_API_KEY — Brendan will crash if GPT is called.")
 else:
-    print("✅ Brendan backend loaded and OpenAI key detected")
+    logger.info("✅ Brendan backend loaded and OpenAI key detected")
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# === Airtable Endpoints (built once at import) ===
+# Calls go through the shared pooled session, which already carries the auth + JSON headers.
+AIRTABLE_TABLE_URL = f"{AIRTABLE_API_URL}/{quote(TABLE_NAME)}"
+AIRTABLE_RECORD_URL_PREFIX = AIRTABLE_TABLE_URL + "/"  # + record_id
+AIRTABLE_SCHEMA_URL = f"https://api.airtable.com/v0/meta/bases/{settings.AIRTABLE_BASE_ID}/tables"
 
 # === Global Schema Cache ===
 AIRTABLE_SCHEMA_CACHE = {
     "fetched": False,
-    "actual_keys": [],
+    "actual_keys": frozenset(),
+    "key_by_lower": {},  # lowercased field name → exact schema name
     "valid_fields": []
 }
 
+# === Session → Record ID Cache ===
+# filterByFormula is Airtable's slowest query mode; once a session's record is known,
+# later lookups fetch the record directly by id. Only the id is cached, never the fields.
+SESSION_RECORD_CACHE = {}  # session_id -> (record_id, expires_at)
+SESSION_RECORD_CACHE_TTL = 300  # seconds
+SESSION_RECORD_CACHE_MAX = 10_000
+
+
+def _cache_session_record(session_id: str, record_id: str):
+    if session_id not in SESSION_RECORD_CACHE and len(SESSION_RECORD_CACHE) >= SESSION_RECORD_CACHE_MAX:
+        SESSION_RECORD_CACHE.clear()
+    SESSION_RECORD_CACHE[session_id] = (record_id, time.time() + SESSION_RECORD_CACHE_TTL)
+
+
+# === GPT Error Alert Email (Office365 SMTP) ===
+ERROR_EMAIL_SENDER = "info@orcacleaning.com.au"
+ERROR_EMAIL_RECIPIENT = "admin@orcacleaning.com.au"
+SMTP_SERVER = "smtp.office365.com"
+SMTP_PORT = 587  # Office365 client submission is STARTTLS-only (no implicit TLS on 465)
+SMTP_TIMEOUT = 10  # seconds — never let a stalled relay hang the caller
+
 # === Boolean Value True Equivalents ===
 TRUE_VALUES = {"yes", "true", "1", "on", "checked", "t"}
 
@@ -269,11 +297,6 @@ def create_new_quote(session_id: str, force_new: bool = False):
             raise ValueError("Session ID is required for creating a new quote.")
         
         quote_id = get_next_quote_id()
-        url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{quote(TABLE_NAME)}"
-        headers = {
-            "Authorization": f"Bearer {settings.AIRTABLE_API_KEY}",
-            "Content-Type": "application/json"
-        }
 
         timestamp = datetime.utcnow().isoformat()
         fields = {
@@ -290,7 +313,7 @@ def create_new_quote(session_id: str, force_new: bool = False):
         log_debug_event(None, "BACKEND", "Quote Payload", json.dumps(fields, indent=2))
 
         payload = {"fields": fields}
-        res = requests.post(url, headers=headers, json=payload)
+        res = session.post(AIRTABLE_TABLE_URL, timeout=AIRTABLE_TIMEOUT, json=payload)
         res.raise_for_status()
 
         response = res.json()
@@ -314,10 +337,13 @@ def create_new_quote(session_id: str, force_new: bool = False):
             logger.error(f"❌ {error_msg}")
             raise HTTPException(status_code=500, detail="Session ID mismatch during quote creation.")
 
+        # A forced new quote replaces the session's old record — repoint the cache at it
+        _cache_session_record(session_id, record_id)
+
         flushed = flush_debug_log(record_id)
         if flushed:
-            update_quote_record(record_id, {"debug_log": flushed})
-            log_debug_event(record_id, "BACKEND", "Debug Log Flushed", f"{len(flushed)} chars flushed post-create")
+            queue_quote_update(record_id, {"debug_log": flushed})
+            logger.debug(f"📄 Debug log flushed for {record_id}: {len(flushed)} chars post-create")
 
         logger.info(f"✅ New quote created — session_id: {session_id} | quote_id: {quote_id} | record_id: {record_id}")
         log_debug_event(record_id, "BACKEND", "New Quote Created", f"Session: {session_id}, Quote ID: {quote_id}, Record ID: {record_id}")
@@ -387,27 +413,37 @@ def get_quote_by_session(session_id: str):
 
         log_debug_event(None, "BACKEND", "Session Lookup Start", f"Searching Airtable for session_id: {session_id}")
 
-        safe_table_name = quote(TABLE_NAME)
-        url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{safe_table_name}"
-        headers = {"Authorization": f"Bearer {settings.AIRTABLE_API_KEY}"}
         params = {
             "filterByFormula": f"{{session_id}} = '{session_id}'",
             "maxRecords": 1
         }
 
+        # Fast path: known session → fetch the record directly (no formula scan)
+        records = None
+        cached = SESSION_RECORD_CACHE.pop(session_id, None)
+        if cached and cached[1] > time.time():
+            try:
+                res = session.get(AIRTABLE_RECORD_URL_PREFIX + cached[0], timeout=AIRTABLE_TIMEOUT)
+                if res.ok:
+                    records = [res.json()]
+            except requests.exceptions.RequestException as e:
+                log_debug_event(None, "BACKEND", "Cached Record Fetch Failed", str(e))
+
         max_retries = 5
         for attempt in range(max_retries):
             try:
-                res = requests.get(url, headers=headers, params=params)
-                res.raise_for_status()
+                if records is None:
+                    res = session.get(AIRTABLE_TABLE_URL, timeout=AIRTABLE_TIMEOUT, params=params)
+                    res.raise_for_status()
+                    records = res.json().get("records", [])
 
-                records = res.json().get("records", [])
                 if not records:
                     log_debug_event(None, "BACKEND", f"Session Not Found (Attempt {attempt+1})", f"No record found for session_id={session_id}")
                     if attempt < max_retries - 1:
                         delay = 2 ** attempt
                         log_debug_event(None, "BACKEND", "Retry Delay", f"Waiting {delay}s before retry...")
                         time.sleep(delay)
+                        records = None
                         continue
                     log_debug_event(None, "BACKEND", "Final Session Lookup Failure", f"session_id={session_id} not found after {max_retries} attempts.")
                     return None
@@ -435,6 +471,8 @@ def get_quote_by_session(session_id: str):
                     "fields": fields
                 }
 
+                _cache_session_record(session_id, record_id)
+
                 log_debug_event(record_id, "BACKEND", "Session Found", f"session_id={session_id}, quote_id={quote_id}, fields={list(fields.keys())}")
                 return result
 
@@ -453,6 +491,109 @@ def get_quote_by_session(session_id: str):
         return None
 
 
+# === Field Normalizers (dispatch table built once at import) ===
+MAX_REASONABLE_INT = 100
+SELECT_FIELDS = frozenset({"carpet_cleaning", "furnished", "quote_stage"})
+QUOTE_STAGES = frozenset({
+    "Gathering Info", "Quote Calculated", "Gathering Personal Info",
+    "Personal Info Received", "Booking Confirmed", "Abuse Warning", "Chat Banned"
+})
+FLOAT_FIELDS = frozenset({
+    "gst_applied", "total_price", "base_hourly_rate", "price_per_session",
+    "estimated_time_mins", "discount_applied", "mandurah_surcharge",
+    "after_hours_surcharge", "weekend_surcharge", "calculated_hours"
+})
+NO_SPECIAL_REQUESTS = frozenset({"no", "none", "false", "no special requests", "n/a"})
+_SKIP = object()  # returned by a normalizer to drop the field
+QUOTED_NAME_RE = re.compile(r'"([^"]+)"')
+
+
+def _norm_carpet_cleaning(record_id, key, value):
+    val = str(value).strip().capitalize()
+    return val if val in ("Yes", "No") else ""
+
+
+def _norm_furnished(record_id, key, value):
+    val = str(value).strip().capitalize()
+    return val if val in ("Furnished", "Unfurnished") else ""
+
+
+def _norm_quote_stage(record_id, key, value):
+    if str(value).strip() not in QUOTE_STAGES:
+        log_debug_event(record_id, "BACKEND", "Quote Stage Rejected", f"{value} not in {sorted(QUOTE_STAGES)}")
+        return _SKIP
+    return value
+
+
+def _norm_int(record_id, key, value):
+    if not isinstance(value, (int, float)):
+        value = int(float(value))
+    if value > MAX_REASONABLE_INT:
+        logger.warning(f"⚠️ Clamping large int for {key}: {value}")
+        log_debug_event(record_id, "BACKEND", "Int Clamped", f"{key}: {value}")
+        value = MAX_REASONABLE_INT
+    return value
+
+
+def _norm_bool(record_id, key, value):
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower() in TRUE_VALUES
+    log_debug_event(record_id, "BACKEND", "Bool Normalized", f"{key}: {value} → {normalized}")
+    return normalized
+
+
+def _norm_float(record_id, key, value):
+    return float(value)
+
+
+def _norm_special_requests(record_id, key, value):
+    if not value or str(value).strip().lower() in NO_SPECIAL_REQUESTS:
+        return ""
+    return str(value).strip()
+
+
+def _norm_extra_hours(record_id, key, value):
+    return float(value) if value not in (None, "") else 0.0
+
+
+def _norm_strip(record_id, key, value):
+    return str(value).strip()
+
+
+def _norm_default(record_id, key, value):
+    if isinstance(value, (int, float, bool)):
+        return value
+    return "" if value is None else str(value).strip()
+
+
+# Later entries win, mirroring the precedence of the old if/elif chain
+_NORMALIZERS = {
+    "pdf_url": _norm_strip,
+    "extra_hours_requested": _norm_extra_hours,
+    "special_requests": _norm_special_requests,
+    **dict.fromkeys(FLOAT_FIELDS, _norm_float),
+    **dict.fromkeys(BOOLEAN_FIELDS, _norm_bool),
+    **dict.fromkeys(INTEGER_FIELDS, _norm_int),
+    "quote_stage": _norm_quote_stage,
+    "furnished": _norm_furnished,
+    "carpet_cleaning": _norm_carpet_cleaning,
+}
+
+
+def _rejected_field(error_body, fields: dict):
+    """
+    Pulls the offending field out of an Airtable 422, e.g.
+    'Unknown field name: "foo"' or 'Field "foo" cannot accept the provided value'.
+    """
+    error = error_body.get("error") if isinstance(error_body, dict) else None
+    message = error.get("message", "") if isinstance(error, dict) else ""
+    for name in QUOTED_NAME_RE.findall(str(message)):
+        if name in fields:
+            return name
+    return None
+
+
 # === Update Quote Record ====
 
 def update_quote_record(record_id: str, fields: dict):
@@ -465,26 +606,21 @@ def update_quote_record(record_id: str, fields: dict):
         logger.warning("⚠️ update_quote_record called with no record_id")
         return []
 
-    safe_table_name = quote(TABLE_NAME)
-    url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{safe_table_name}/{record_id}"
-    headers = {
-        "Authorization": f"Bearer {settings.AIRTABLE_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    url = AIRTABLE_RECORD_URL_PREFIX + record_id
 
     log_debug_event(record_id, "BACKEND", "Function Start", f"update_quote_record(record_id={record_id}, fields={list(fields.keys())})")
 
-    actual_keys = AIRTABLE_SCHEMA_CACHE.get("actual_keys", set())
+    actual_keys = AIRTABLE_SCHEMA_CACHE.get("actual_keys", frozenset())
     if not AIRTABLE_SCHEMA_CACHE.get("fetched"):
         try:
-            schema_url = f"https://api.airtable.com/v0/meta/bases/{settings.AIRTABLE_BASE_ID}/tables"
-            schema_res = requests.get(schema_url, headers={"Authorization": f"Bearer {settings.AIRTABLE_API_KEY}"})
+            schema_res = session.get(AIRTABLE_SCHEMA_URL, timeout=AIRTABLE_TIMEOUT)
             schema_res.raise_for_status()
             tables = schema_res.json().get("tables", [])
             for table in tables:
                 if table.get("name") == TABLE_NAME:
-                    actual_keys = {f["name"] for f in table.get("fields", [])}
+                    actual_keys = frozenset(f["name"] for f in table.get("fields", []))
                     AIRTABLE_SCHEMA_CACHE["actual_keys"] = actual_keys
+                    AIRTABLE_SCHEMA_CACHE["key_by_lower"] = {k.lower(): k for k in actual_keys}
                     AIRTABLE_SCHEMA_CACHE["fetched"] = True
                     log_debug_event(record_id, "BACKEND", "Schema Cached", f"{len(actual_keys)} fields loaded from Airtable schema")
                     break
@@ -498,14 +634,18 @@ def update_quote_record(record_id: str, fields: dict):
             log_debug_event(record_id, "BACKEND", "Debug Field Skipped", "debug_log not in schema or schema not fetched")
 
     normalized_fields = {}
-    MAX_REASONABLE_INT = 100
-    SELECT_FIELDS = {"carpet_cleaning", "furnished", "quote_stage"}
+
+    # Loop-invariant lookups bound once; the case-insensitive schema match is a dict hit, not a scan
+    field_map_get = FIELD_MAP.get
+    schema_key_get = AIRTABLE_SCHEMA_CACHE.get("key_by_lower", {}).get
+    normalizer_get = _NORMALIZERS.get
 
     for raw_key, value in fields.items():
-        key = FIELD_MAP.get(raw_key, raw_key)
-        corrected_key = next((k for k in actual_keys if k.lower() == key.lower()), key)
+        key = field_map_get(raw_key, raw_key)
+        corrected_key = schema_key_get(key.lower(), key)
 
-        log_debug_event(record_id, "BACKEND", "Raw Field Input", f"{raw_key} → {corrected_key} = {value}")
+        shown = f"<{len(str(value))} chars>" if corrected_key in LOG_FIELDS else value
+        log_debug_event(record_id, "BACKEND", "Raw Field Input", f"{raw_key} → {corrected_key} = {shown}")
 
         if corrected_key not in actual_keys or corrected_key not in VALID_AIRTABLE_FIELDS:
             logger.warning(f"⚠️ Skipping invalid field: {corrected_key}")
@@ -517,51 +657,9 @@ def update_quote_record(record_id: str, fields: dict):
             continue
 
         try:
-            if corrected_key == "carpet_cleaning":
-                val = str(value).strip().capitalize()
-                value = val if val in {"Yes", "No"} else ""
-            elif corrected_key == "furnished":
-                val = str(value).strip().capitalize()
-                value = val if val in {"Furnished", "Unfurnished"} else ""
-            elif corrected_key == "quote_stage":
-                allowed = {
-                    "Gathering Info", "Quote Calculated", "Gathering Personal Info",
-                    "Personal Info Received", "Booking Confirmed", "Abuse Warning", "Chat Banned"
-                }
-                if str(value).strip() not in allowed:
-                    log_debug_event(record_id, "BACKEND", "Quote Stage Rejected", f"{value} not in {allowed}")
-                    continue
-            elif corrected_key in INTEGER_FIELDS:
-                if not isinstance(value, (int, float)):
-                    value = int(float(value))
-                if value > MAX_REASONABLE_INT:
-                    logger.warning(f"⚠️ Clamping large int for {corrected_key}: {value}")
-                    log_debug_event(record_id, "BACKEND", "Int Clamped", f"{corrected_key}: {value}")
-                    value = MAX_REASONABLE_INT
-            elif corrected_key in BOOLEAN_FIELDS:
-                if not isinstance(value, bool):
-                    original = value
-                    value = str(value).strip().lower() in {"yes", "true", "1", "on", "checked", "t"}
-                    log_debug_event(record_id, "BACKEND", "Bool Normalized", f"{corrected_key}: {original} → {value}")
-            elif corrected_key in {
-                "gst_applied", "total_price", "base_hourly_rate", "price_per_session",
-                "estimated_time_mins", "discount_applied", "mandurah_surcharge",
-                "after_hours_surcharge", "weekend_surcharge", "calculated_hours"
-            }:
-                value = float(value)
-            elif corrected_key == "special_requests":
-                if not value or str(value).strip().lower() in {"no", "none", "false", "no special requests", "n/a"}:
-                    value = ""
-                else:
-                    value = str(value).strip()
-            elif corrected_key == "extra_hours_requested":
-                value = float(value) if value not in [None, ""] else 0.0
-            elif corrected_key == "pdf_url":
-                value = str(value).strip()
-            else:
-                if not isinstance(value, (int, float, bool)):
-                    value = "" if value is None else str(value).strip()
-
+            value = normalizer_get(corrected_key, _norm_default)(record_id, corrected_key, value)
+            if value is _SKIP:
+                continue
         except Exception as e:
             logger.warning(f"⚠️ Failed to normalize {corrected_key}: {e}")
             log_debug_event(record_id, "BACKEND", "Normalization Error", f"{corrected_key}: {e}")
@@ -574,68 +672,84 @@ def update_quote_record(record_id: str, fields: dict):
 
         normalized_fields[corrected_key] = value
 
-    for log_field in ["debug_log", "message_log"]:
-        if log_field in fields and log_field not in normalized_fields:
+    for log_field in ("debug_log", "message_log"):
+        if log_field in fields and log_field not in normalized_fields and log_field in actual_keys:
             normalized_fields[log_field] = str(fields[log_field]) if fields[log_field] else ""
 
     debug_log = flush_debug_log(record_id)
     if debug_log and "debug_log" in actual_keys:
         normalized_fields["debug_log"] = debug_log
-        log_debug_event(record_id, "BACKEND", "Debug Log Flushed", f"{len(debug_log)} chars flushed to Airtable")
+        logger.debug(f"📄 Debug log flushed for {record_id}: {len(debug_log)} chars to Airtable")
 
+    # Every key was checked against the schema + VALID_AIRTABLE_FIELDS as it was added
     if not normalized_fields:
         log_debug_event(record_id, "BACKEND", "Update Skipped", "No normalized fields to update.")
         return []
 
-    validated_fields = {k: v for k, v in normalized_fields.items() if k in actual_keys and k in VALID_AIRTABLE_FIELDS}
-    if not validated_fields:
-        log_debug_event(record_id, "BACKEND", "Validation Failed", "All fields invalid after schema + rules filtering.")
+    # Checked right before the PATCH so a half-open probe always records an outcome
+    if not airtable_breaker.before():
+        logger.warning(f"⚠️ Airtable circuit open — skipping update for {record_id}")
+        log_debug_event(record_id, "BACKEND", "Update Skipped", "Airtable circuit breaker is open.")
         return []
 
     logger.info(f"\n📤 Updating Airtable Record: {record_id}")
-    logger.info(f"🛠 Payload: {json.dumps(validated_fields, indent=2)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🛠 Payload: %s", orjson.dumps(normalized_fields).decode())
 
     try:
         # Make sure that Airtable has processed the record before the update
         time.sleep(5)  # Added delay to allow Airtable to process the update
 
-        res = requests.patch(url, headers=headers, json={"fields": validated_fields})
+        res = session.patch(url, timeout=AIRTABLE_TIMEOUT, data=orjson.dumps({"fields": normalized_fields}))
+        airtable_breaker.record_response(res)
         if res.ok:
             logger.info("✅ Airtable bulk update successful.")
-            log_debug_event(record_id, "BACKEND", "Record Updated (Bulk)", f"Fields: {list(validated_fields.keys())}")
-            return list(validated_fields.keys())
+            log_debug_event(record_id, "BACKEND", "Record Updated (Bulk)", f"Fields: {list(normalized_fields.keys())}")
+            return list(normalized_fields.keys())
 
         logger.error(f"❌ Airtable bulk update failed ({res.status_code})")
+        error_body = None
         try:
-            logger.error(f"🧾 Airtable Error: {res.json()}")
-            log_debug_event(record_id, "BACKEND", "Airtable Error", str(res.json()))
+            error_body = res.json()
+            logger.error(f"🧾 Airtable Error: {error_body}")
+            log_debug_event(record_id, "BACKEND", "Airtable Error", str(error_body))
         except:
             logger.error("🧾 Airtable Error: (non-JSON)")
             log_debug_event(record_id, "BACKEND", "Airtable Error", "Non-JSON response")
 
     except Exception as e:
+        airtable_breaker.record_failure()
         logger.error(f"❌ Exception in Airtable bulk update: {e}")
         log_debug_event(record_id, "BACKEND", "Bulk Update Exception", str(e))
+        return []
 
-    successful = []
-    for key, value in validated_fields.items():
-        try:
-            res = requests.patch(url, headers=headers, json={"fields": {key: value}})
-            if res.ok:
-                logger.info(f"✅ Field '{key}' updated individually.")
-                successful.append(key)
-            else:
-                logger.error(f"❌ Field '{key}' update failed.")
-        except Exception as e:
-            logger.error(f"❌ Exception on '{key}': {e}")
-            log_debug_event(record_id, "BACKEND", "Fallback Field Update Error", f"{key}: {e}")
+    # 429/5xx were already retried (with backoff) by the session — only a rejected field (422) is worth retrying
+    if res.status_code != 422:
+        log_debug_event(record_id, "BACKEND", "Update Failed", f"Status {res.status_code} — retry skipped.")
+        return []
 
-    if successful:
-        log_debug_event(record_id, "BACKEND", "Record Updated (Fallback)", f"Fields updated: {successful}")
-    else:
-        log_debug_event(record_id, "BACKEND", "Update Failed", "No fields updated in fallback.")
+    # One retry without the field Airtable named in its error — at most 2 PATCHes per update
+    rejected = _rejected_field(error_body, normalized_fields)
+    if not rejected or len(normalized_fields) == 1:
+        log_debug_event(record_id, "BACKEND", "Update Failed", "422 without a retryable field — no fields updated.")
+        return []
+
+    retry_fields = {k: v for k, v in normalized_fields.items() if k != rejected}
+    logger.warning(f"⚠️ Airtable rejected '{rejected}' — retrying without it.")
+    log_debug_event(record_id, "BACKEND", "Field Rejected", f"{rejected} dropped, retrying {len(retry_fields)} field(s)")
+    try:
+        res = session.patch(url, timeout=AIRTABLE_TIMEOUT, data=orjson.dumps({"fields": retry_fields}))
+        if res.ok:
+            logger.info("✅ Airtable update successful without rejected field.")
+            log_debug_event(record_id, "BACKEND", "Record Updated (Retry)", f"Fields: {list(retry_fields.keys())}")
+            return list(retry_fields.keys())
+        logger.error(f"❌ Airtable retry failed ({res.status_code})")
+        log_debug_event(record_id, "BACKEND", "Update Failed", f"Retry without {rejected} failed: {res.status_code}")
+    except Exception as e:
+        logger.error(f"❌ Exception in Airtable retry: {e}")
+        log_debug_event(record_id, "BACKEND", "Retry Update Exception", str(e))
 
-    return successful
+    return []
 
 
 # === Inline Quote Summary Helper ===
@@ -860,24 +974,6 @@ def generate_next_actions(quote_stage: str, fields: dict):
         log_debug_event(None, "BACKEND", "Next Actions Fallback", f"Unrecognized stage: '{stage}' → Using fallback response")
         return fallback
 
-# === Extract Name ===
-
-def extract_first_name(full_name: str) -> str:
-    """
-    Extracts and formats the first name from a full name string.
-    Returns capitalized first name or empty string.
-    """
-    try:
-        if not full_name:
-            return ""
-        name = str(full_name).strip().split(" ")[0]
-        name_clean = re.sub(r"[^a-zA-Z\-]", "", name)  # allow hyphenated names
-        return name_clean.capitalize()
-    except Exception as e:
-        logger.warning(f"⚠️ extract_first_name() failed: {e}")
-        return ""
-
-
 # === GPT Extraction (Production-Grade) ===
 
 async def extract_properties_from_gpt4(message: str, log: str, record_id: str = None, session_id: str = None, quote_id: str = None, skip_log_lookup: bool = False):
@@ -899,7 +995,7 @@ async def extract_properties_from_gpt4(message: str, log: str, record_id: str =
         log_debug_event(record_id, "GPT", "Weak Message Skipped", f"Weak input detected: '{message}'")
         flushed = flush_debug_log(record_id)
         if flushed:
-            update_quote_record(record_id, {"debug_log": flushed, "source": "Brendan"})
+            queue_quote_update(record_id, {"debug_log": flushed, "source": "Brendan"})
         log_debug_event(record_id, "GPT", "Final Reply", reply)
         duration = round(time.time() - start_time, 3)
         log_debug_event(record_id, "GPT", "Function Duration", f"Weak input handled in {duration}s")
@@ -972,7 +1068,7 @@ async def extract_properties_from_gpt4(message: str, log: str, record_id: str =
 
     try:
         gpt_start = time.time()
-        res = client.chat.completions.create(
+        res = get_openai_client().chat.completions.create(
             model="gpt-4-turbo",
             messages=messages,
             max_tokens=3000,
@@ -1044,8 +1140,8 @@ async def extract_properties_from_gpt4(message: str, log: str, record_id: str =
 
     flushed = flush_debug_log(record_id)
     if flushed:
-        update_quote_record(record_id, {"debug_log": flushed})
-        log_debug_event(record_id, "GPT", "Debug Log Flushed", f"{len(flushed)} chars flushed")
+        queue_quote_update(record_id, {"debug_log": flushed})
+        logger.debug(f"📄 Debug log flushed for {record_id}: {len(flushed)} chars")
 
     return safe_props, reply
 
@@ -1056,13 +1152,7 @@ def send_gpt_error_email(error_msg: str):
     Sends a critical error email if GPT extraction fails.
     If logging or email fails, logs to Render console as fallback.
     """
-    from app.main import client  # ✅ Fix 1: use shared client definition if ever needed
-
     try:
-        sender_email = "info@orcacleaning.com.au"
-        recipient_email = "admin@orcacleaning.com.au"
-        smtp_server = "smtp.office365.com"
-        smtp_port = 587
         smtp_pass = settings.SMTP_PASS
 
         if not smtp_pass:
@@ -1073,21 +1163,23 @@ def send_gpt_error_email(error_msg: str):
                 logger.error(f"❌ Failed to log missing SMTP_PASS: {e}")
             return
 
-        msg = MIMEText(error_msg)
+        # SMTP policy = CRLF endings + RFC-compliant line folding (tracebacks can exceed 998 chars)
+        msg = EmailMessage(policy=SMTP_POLICY)
         msg["Subject"] = "🚨 Brendan GPT Extraction Error"
-        msg["From"] = sender_email
-        msg["To"] = recipient_email
+        msg["From"] = ERROR_EMAIL_SENDER
+        msg["To"] = ERROR_EMAIL_RECIPIENT
+        msg.set_content(error_msg)
 
         for attempt in range(2):
             try:
-                with smtplib.SMTP(smtp_server, smtp_port) as server:
+                with smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT) as server:
                     server.starttls()
-                    server.login(sender_email, smtp_pass)
-                    server.sendmail(sender_email, [recipient_email], msg.as_string())
+                    server.login(ERROR_EMAIL_SENDER, smtp_pass)
+                    server.send_message(msg)
 
                 logger.info("✅ GPT error email sent successfully.")
                 try:
-                    log_debug_event(None, "BACKEND", "GPT Error Email Sent", f"Sent to {recipient_email} (attempt {attempt + 1})")
+                    log_debug_event(None, "BACKEND", "GPT Error Email Sent", f"Sent to {ERROR_EMAIL_RECIPIENT} (attempt {attempt + 1})")
                 except Exception as log_success:
                     logger.warning(f"⚠️ Logging success failed: {log_success}")
                 break
@@ -1122,7 +1214,7 @@ def send_gpt_error_email(error_msg: str):
                 record_id = match.group(1).strip()
                 flushed = flush_debug_log(record_id)
                 if flushed:
-                    update_quote_record(record_id, {"debug_log": flushed})
+                    queue_quote_update(record_id, {"debug_log": flushed})
         except Exception as e:
             logger.warning(f"⚠️ Failed to flush debug log after error: {e}")
             try:
@@ -1161,9 +1253,7 @@ def append_message_log(record_id: str, message: str, sender: str):
 
     # Fetch current message_log from Airtable
     try:
-        url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{TABLE_NAME}/{record_id}"
-        headers = {"Authorization": f"Bearer {settings.AIRTABLE_API_KEY}"}
-        res = requests.get(url, headers=headers)
+        res = session.get(AIRTABLE_RECORD_URL_PREFIX + record_id, timeout=AIRTABLE_TIMEOUT)
         res.raise_for_status()
         airtable_data = res.json()
         old_log = str(airtable_data.get("fields", {}).get("message_log", "")).strip()
@@ -1211,8 +1301,8 @@ def append_message_log(record_id: str, message: str, sender: str):
     try:
         flushed = flush_debug_log(record_id)
         if flushed:
-            update_quote_record(record_id, {"debug_log": flushed})
-            log_debug_event(record_id, "BACKEND", "Debug Log Flushed", f"{len(flushed)} chars flushed to Airtable")
+            queue_quote_update(record_id, {"debug_log": flushed})
+            logger.debug(f"📄 Debug log flushed for {record_id}: {len(flushed)} chars to Airtable")
         else:
             log_debug_event(record_id, "BACKEND", "Debug Log Flush Skipped", "No pending debug log to flush")
     except Exception as e:
@@ -1348,7 +1438,7 @@ async def handle_chat_init(session_id: str):
         flushed = flush_debug_log(record_id)
         if flushed:
             log_debug_event(record_id, "BACKEND", "Flushing Initial Debug Log", f"{len(flushed)} chars")
-            update_quote_record(record_id, {"debug_log": flushed})
+            queue_quote_update(record_id, {"debug_log": flushed})
             log_debug_event(record_id, "BACKEND", "Initial Debug Log Saved", "Flushed to Airtable")
 
         log_debug_event(record_id, "BACKEND", "Init Complete", f"Final response sent. Length: {len(reply)}")
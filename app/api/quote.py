@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Response, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
 from app.models.quote_models import QuoteRequest, QuoteResponse
 from app.services.quote_logic import calculate_quote
-from app.services.pdf_generator import generate_quote_pdf
+from app.services.pdf_generator import generate_quote_pdf, STATIC_PDF_DIR
 import os
 
 router = APIRouter()
 
 # === Endpoint: Calculate Quote ===
 @router.post("/calculate-quote", response_model=QuoteResponse)
-def calculate_quote_endpoint(quote_request: QuoteRequest):
+async def calculate_quote_endpoint(quote_request: QuoteRequest):
     try:
         return calculate_quote(quote_request)
     except Exception as e:
@@ -18,15 +19,16 @@ def calculate_quote_endpoint(quote_request: QuoteRequest):
 @router.post("/generate-pdf")
 def generate_pdf(quote: QuoteResponse):
     try:
-        filepath, _ = generate_quote_pdf(quote.dict())
+        generate_quote_pdf(quote.dict())
+        filepath = f"{STATIC_PDF_DIR}/{quote.quote_id}.pdf"
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"PDF not found at: {filepath}")
 
-        with open(filepath, "rb") as file:
-            return Response(
-                content=file.read(),
-                media_type="application/pdf",
-                headers={"Content-Disposition": f"attachment; filename={quote.quote_id}.pdf"}
-            )
+        # Streamed from disk in chunks — the PDF is never held in memory whole
+        return FileResponse(
+            filepath,
+            media_type="application/pdf",
+            filename=f"{quote.quote_id}.pdf"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {str(e)}")
@@ -3,18 +3,15 @@
 import base64
 import datetime
 import logging
-import os
 import requests
 
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from dotenv import load_dotenv
 
-# === Load environment variables ===
-load_dotenv()
+from app.config import get_settings
 
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_TOKEN = get_settings().GITHUB_TOKEN
 GITHUB_USERNAME = "ORCACleaning"
 GITHUB_REPO = "brendan_backend"
 DEFAULT_BRANCH = "main"
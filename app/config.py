@@ -2,6 +2,7 @@
 
 import os
 import logging
+from functools import lru_cache
 from logging.handlers import RotatingFileHandler
 from pydantic_settings import BaseSettings
 
@@ -22,13 +23,52 @@ class Settings(BaseSettings):
     BOOKING_URL_BASE: str = "https://orcacleaning.com.au/schedule"
     SMTP_PASS: str
     GITHUB_TOKEN: str
+    LOG_LEVEL: str = "DEBUG"
+    ENV: str = "prod"  # "dev" → uvicorn auto-reload + access log
+    WEB_CONCURRENCY: int = 2
+    UVICORN_LIMIT_CONCURRENCY: int = 400  # per worker — beyond this uvicorn answers 503 instead of queueing
+    ANYIO_THREADS: int = 100  # threadpool size for sync endpoints
+    ALLOWED_ORIGINS: str = "https://orcacleaning.com.au,https://www.orcacleaning.com.au"  # comma-separated CORS origins
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
+        extra = "ignore"  # .env also carries PRICING_* keys for PricingSettings
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Parses .env and the process environment once per worker.
+    """
+    return Settings()
+
+
+settings = get_settings()
+
+
+# === Pricing Settings (override with PRICING_* env vars) ===
+class PricingSettings(BaseSettings):
+    BASE_HOURLY_RATE: float = 75.0
+    SEASONAL_DISCOUNT_PERCENT: int = 10
+    PROPERTY_MANAGER_DISCOUNT: int = 5
+    GST_PERCENT: int = 10
+
+    WEEKEND_SURCHARGE_PERCENT: int = 100
+    AFTER_HOURS_SURCHARGE_PERCENT: int = 15
+    MANDURAH_SURCHARGE_PERCENT: int = 30
+
+    FRIDGE_MINS: int = 30
+    RANGE_HOOD_MINS: int = 20
+
+    class Config:
+        env_prefix = "PRICING_"
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+pricing = PricingSettings()
 
 # === Logging Setup ===
 
@@ -37,7 +77,7 @@ LOG_FILE = os.path.join(LOG_DIR, "brendan.log")
 os.makedirs(LOG_DIR, exist_ok=True)
 
 logger = logging.getLogger("brendan")
-logger.setLevel(logging.DEBUG)
+logger.setLevel(settings.LOG_LEVEL.upper())
 
 formatter = logging.Formatter(
     "%(asctime)s - %(levelname)s - %(message)s"
@@ -0,0 +1,155 @@
+# === factory.py ===
+# Builds the Brendan FastAPI app. Every entrypoint (run.py, app.main) calls create_app()
+# so CORS, routers, lifespan and response class are wired in exactly one place.
+
+import asyncio
+import hashlib
+import logging
+import time
+from contextlib import asynccontextmanager
+
+import orjson
+from anyio import to_thread
+from fastapi import APIRouter, FastAPI, Depends
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+
+from app.config import TABLE_NAME, get_settings
+from app.utils.logging_utils import log_debug_event, start_flusher, drain_update_queue
+from app.services.airtable_client import open_async_client, close_async_client, get_airtable_client
+
+settings = get_settings()
+logger = logging.getLogger("BrendanStartup")
+
+
+# === Key Load Debug Logging (never the key itself — length + short hash to tell keys apart) ===
+def _key_fingerprint(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()[:8]
+
+
+def _log_credentials():
+    """Startup check — missing keys are errors; loaded keys are noted at DEBUG only (no values)."""
+    api_key = settings.OPENAI_API_KEY
+    airtable_key = settings.AIRTABLE_API_KEY
+    airtable_base = settings.AIRTABLE_BASE_ID
+
+    if not api_key:
+        logger.error("❌ ERROR: OPENAI_API_KEY not loaded!")
+    if not (airtable_key and airtable_base):
+        logger.error("❌ ERROR: Airtable credentials not loaded! Check .env.")
+
+    if logger.isEnabledFor(logging.DEBUG):
+        if api_key:
+            logger.debug("✅ OpenAI key loaded (len=%d, sha8=%s)", len(api_key), _key_fingerprint(api_key))
+        if airtable_key and airtable_base:
+            logger.debug("✅ Airtable key loaded (len=%d, sha8=%s), base=%s", len(airtable_key), _key_fingerprint(airtable_key), airtable_base)
+
+
+# === App Lifespan (shared Airtable client, background update flusher, threadpool size) ===
+@asynccontextmanager
+async def lifespan(app):
+    # Sync endpoints (GPT + Airtable calls) run in AnyIO's threadpool — 40 threads by default
+    to_thread.current_default_thread_limiter().total_tokens = settings.ANYIO_THREADS
+    await open_async_client()
+    start_flusher()
+    yield
+    await to_thread.run_sync(drain_update_queue)
+    await close_async_client()
+
+
+# === System Endpoints (root, ping, readiness) ===
+system_router = APIRouter()
+
+# Bodies serialized once at import, served straight from the event loop
+ROOT_BODY = orjson.dumps({"message": "Welcome to Brendan Backend! 🎉"})
+PING_BODY = orjson.dumps({"ping": "pong"})
+
+@system_router.get("/")
+async def read_root():
+    try:
+        log_debug_event(None, "LOCAL", "Ping Root", "Root endpoint accessed")
+    except Exception as e:
+        logger.warning(f"⚠️ Error logging root ping: {e}")
+    return Response(content=ROOT_BODY, media_type="application/json")
+
+@system_router.get("/ping")
+async def ping():
+    try:
+        log_debug_event(None, "LOCAL", "Ping /ping", "Health check requested")
+    except Exception as e:
+        logger.warning(f"⚠️ Error logging ping: {e}")
+    return Response(content=PING_BODY, media_type="application/json")
+
+# === Readiness Check (Airtable credentials + reachability, cached 60s) ===
+HEALTHZ_TTL = 60
+HEALTHZ_TIMEOUT = 2  # seconds — one attempt, so a degraded Airtable can't stall the probe
+_healthz_cache = {"checked_at": 0.0, "ok": False, "detail": ""}
+_healthz_lock = asyncio.Lock()  # one refresh at a time; concurrent probes wait and reuse its result
+
+@system_router.get("/healthz")
+async def healthz(client=Depends(get_airtable_client)):
+    if time.monotonic() - _healthz_cache["checked_at"] > HEALTHZ_TTL:
+        async with _healthz_lock:
+            if time.monotonic() - _healthz_cache["checked_at"] > HEALTHZ_TTL:
+                try:
+                    # Straight client call, not airtable_request — no retries/backoff for a probe
+                    res = await client.get(f"/{TABLE_NAME}", params={"maxRecords": 1, "fields[]": "quote_id"}, timeout=HEALTHZ_TIMEOUT)
+                    _healthz_cache["ok"] = res.status_code == 200
+                    _healthz_cache["detail"] = "" if res.is_success else f"Airtable returned {res.status_code}"
+                except Exception as e:
+                    _healthz_cache["ok"] = False
+                    _healthz_cache["detail"] = f"Airtable unreachable: {e}"
+                _healthz_cache["checked_at"] = time.monotonic()
+
+    if _healthz_cache["ok"]:
+        return {"status": "ok"}
+    return ORJSONResponse(status_code=503, content={"status": "unavailable", "detail": _healthz_cache["detail"]})
+
+
+# === App Factory ===
+def create_app(api_prefix: str = "", allowed_origins: list = None, include_routers: bool = True) -> FastAPI:
+    """
+    Builds a configured Brendan app. api_prefix mounts the quote/chat routers under a path (e.g. "/api").
+    allowed_origins defaults to the ALLOWED_ORIGINS setting. include_routers=False skips importing
+    the API routers entirely (CLI/smoke-test use).
+    """
+    # === Set logging config for full stdout/stderr capture (no-op if already configured) ===
+    logging.basicConfig(
+        level=settings.LOG_LEVEL.upper(),
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        handlers=[
+            logging.StreamHandler()
+        ]
+    )
+    _log_credentials()
+
+    app = FastAPI(
+        title="Brendan API",
+        description="Backend for Orca Cleaning's AI Quote Assistant - Brendan",
+        version="1.0.0",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
+    )
+
+    # === CORS (explicit origins — a wildcard with credentials reflects Origin on every request) ===
+    if allowed_origins is None:
+        allowed_origins = [o.strip() for o in settings.ALLOWED_ORIGINS.split(",") if o.strip()]
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allowed_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # === Routers (imported here, on first use, via the lazy registry in app/__init__.py) ===
+    app.include_router(system_router)
+    if include_routers:
+        from app import quote_router, filter_response_router, store_customer_router, auto_fixer_router
+
+        app.include_router(filter_response_router, prefix=api_prefix)
+        app.include_router(quote_router, prefix=api_prefix)
+        app.include_router(store_customer_router, prefix=api_prefix)
+        app.include_router(auto_fixer_router)  # ✅ AI Auto-Fix Commit System
+
+    return app
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional
 
 
@@ -66,6 +66,22 @@ class QuoteRequest(BaseModel):
     booking_url: Optional[str] = None
     privacy_acknowledged: Optional[bool] = False
 
+    # === Normalize Boolean Flags Once (Airtable/GPT send "Yes", "true", etc.) ===
+    @field_validator(
+        "oven_cleaning", "window_cleaning", "blind_cleaning",
+        "wall_cleaning", "balcony_cleaning", "deep_cleaning", "fridge_cleaning",
+        "range_hood_cleaning", "garage_cleaning", "upholstery_cleaning",
+        "after_hours_cleaning", "weekend_cleaning", "mandurah_property",
+        "is_property_manager", "privacy_acknowledged",
+        mode="before"
+    )
+    @classmethod
+    def _coerce_bool(cls, v):
+        # Only tidy whitespace/case — pydantic's own bool parsing decides, so junk still 422s
+        if isinstance(v, str):
+            return v.strip().lower()
+        return v
+
 
 # === Output Model for Quote Response ===
 class QuoteResponse(BaseModel):
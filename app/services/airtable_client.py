@@ -0,0 +1,157 @@
+# === airtable_client.py ===
+
+import asyncio
+import random
+import threading
+import time
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import settings
+
+# === Airtable Settings ===
+AIRTABLE_API_URL = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}"
+AIRTABLE_TIMEOUT = (3, 5)  # (connect, read) seconds
+AIRTABLE_MAX_CONCURRENCY = 5  # Airtable allows 5 requests/sec per base
+AIRTABLE_MAX_ATTEMPTS = 5
+AIRTABLE_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# === Shared Session (keep-alive connection pool) ===
+# Reusing one session keeps the TCP+TLS connection to api.airtable.com open
+# between calls instead of re-handshaking on every request.
+session = requests.Session()
+session.headers.update({
+    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY}",
+    "Content-Type": "application/json"
+})
+session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,  # sync endpoints run in a threadpool — allow that many concurrent keep-alive sockets
+        # 429s honour Retry-After; PATCH isn't retried by urllib3 unless listed (record updates are idempotent)
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "PATCH"],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+    )
+)
+
+# === Circuit Breaker (shared by every sync Airtable writer) ===
+class CircuitBreaker:
+    """
+    Closed → open after `threshold` consecutive failures. While open, callers fail fast;
+    after `cooldown` seconds a single half-open probe is let through to test recovery.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def before(self) -> bool:
+        """Returns False when the call should be skipped."""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+    def record_response(self, res):
+        # A 422 is Airtable rejecting our data, not Airtable being down
+        if res.ok or res.status_code == 422:
+            self.record_success()
+        else:
+            self.record_failure()
+
+
+airtable_breaker = CircuitBreaker()
+
+# === Shared Async Client (opened on app startup, closed on shutdown) ===
+async_client = None
+
+
+def _new_async_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=AIRTABLE_API_URL,
+        headers={
+            "Authorization": f"Bearer {settings.AIRTABLE_API_KEY}",
+            "Content-Type": "application/json"
+        },
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        http2=True  # concurrent Airtable calls multiplex over one TLS connection (needs the h2 extra)
+    )
+
+
+async def open_async_client():
+    global async_client
+    if async_client is None or async_client.is_closed:
+        async_client = _new_async_client()
+
+
+async def close_async_client():
+    global async_client
+    if async_client is not None:
+        await async_client.aclose()
+        async_client = None
+
+
+async def get_airtable_client() -> httpx.AsyncClient:
+    """FastAPI dependency — the shared pooled client (opened lazily if startup hook didn't run)."""
+    await open_async_client()
+    return async_client
+
+
+# === Rate-Limited Async Requests ===
+_airtable_semaphore = asyncio.Semaphore(AIRTABLE_MAX_CONCURRENCY)
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return min(30, 2 ** attempt) + random.uniform(0, 1)
+
+
+async def airtable_request(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Sends one Airtable request with at most AIRTABLE_MAX_CONCURRENCY in flight.
+    429/5xx responses are retried after Retry-After (or exponential backoff + jitter).
+    """
+    for attempt in range(AIRTABLE_MAX_ATTEMPTS):
+        async with _airtable_semaphore:
+            response = await client.request(method, url, **kwargs)
+
+        if response.status_code not in AIRTABLE_RETRY_STATUSES or attempt == AIRTABLE_MAX_ATTEMPTS - 1:
+            return response
+
+        # Sleep outside the semaphore so other calls can use the slot
+        await asyncio.sleep(_retry_delay(response, attempt))
+
+    return response
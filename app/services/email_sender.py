@@ -1,3 +1,23 @@
+from string import Template
+
+# === Quote Email Body (parsed once at import) ===
+QUOTE_EMAIL_BODY = Template("""\
+<p>$name_line</p>
+
+<p>Thanks for requesting a quote with Orca Cleaning!</p>
+<p>Your vacate clean quote is ready. You can view or download it here:</p>
+
+<p><a href="$pdf_url" style="font-weight: bold; color: #007BFF;">View Your PDF Quote</a></p>
+
+<p>When you're ready to book, just use this link:</p>
+<p><a href="$booking_url" style="font-weight: bold; color: #28a745;">Book Your Clean</a></p>
+
+<p>If you need to make changes or have any questions, just reply to this email — we’re always happy to help.</p>
+
+<p>Cheers,<br>Brendan<br>Orca Cleaning Team</p>
+""")
+
+
 def send_quote_email(to_email: str, customer_name: str, pdf_url: str, quote_id: str):
     """
     Sends a quote email with a public link to the Render-hosted PDF quote (not as an attachment).
@@ -23,21 +43,11 @@ def send_quote_email(to_email: str, customer_name: str, pdf_url: str, quote_id:
     subject = f"Your Orca Cleaning Vacate Quote ({quote_id})"
     booking_url = f"https://orcacleaning.com.au/schedule?quote_id={quote_id}"
 
-    body_html = f"""\
-<p>{name_line}</p>
-
-<p>Thanks for requesting a quote with Orca Cleaning!</p>
-<p>Your vacate clean quote is ready. You can view or download it here:</p>
-
-<p><a href="{pdf_url}" style="font-weight: bold; color: #007BFF;">View Your PDF Quote</a></p>
-
-<p>When you're ready to book, just use this link:</p>
-<p><a href="{booking_url}" style="font-weight: bold; color: #28a745;">Book Your Clean</a></p>
-
-<p>If you need to make changes or have any questions, just reply to this email — we’re always happy to help.</p>
-
-<p>Cheers,<br>Brendan<br>Orca Cleaning Team</p>
-"""
+    body_html = QUOTE_EMAIL_BODY.substitute(
+        name_line=name_line,
+        pdf_url=pdf_url,
+        booking_url=booking_url
+    )
 
     payload = {
         "message": {
@@ -0,0 +1,14 @@
+# === openai_client.py ===
+
+from functools import lru_cache
+
+from app.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """
+    Shared OpenAI client, built on first use so importing the app doesn't load the openai package.
+    """
+    from openai import OpenAI
+    return OpenAI(api_key=settings.OPENAI_API_KEY)
@@ -1,4 +1,8 @@
 import os
+import fcntl
+import json
+import hashlib
+import tempfile
 from weasyprint import HTML
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from app.api.field_rules import FIELD_MAP
@@ -15,6 +19,10 @@ env = Environment(
 )
 template = env.get_template("quote_template.html")
 
+# Template changes must invalidate cached PDFs even when the quote data is unchanged
+with open(os.path.join(template_dir, "quote_template.html"), "rb") as _f:
+    TEMPLATE_VERSION = hashlib.sha256(_f.read()).hexdigest()
+
 
 def generate_quote_pdf(data: dict) -> str:
     """
@@ -113,9 +121,41 @@ def generate_quote_pdf(data: dict) -> str:
     # === Generate HTML and PDF ===
     try:
         quote_id = data.get("quote_id", "missing-id")
-        html_out = template.render(**cleaned)
         pdf_path = f"{STATIC_PDF_DIR}/{quote_id}.pdf"
-        HTML(string=html_out).write_pdf(pdf_path)
+        hash_path = f"{pdf_path}.sha256"
+        payload_hash = hashlib.sha256(
+            (TEMPLATE_VERSION + json.dumps(cleaned, sort_keys=True, default=str)).encode()
+        ).hexdigest()
+
+        # One render per quote_id at a time (across threads and workers), so the PDF and its
+        # .sha256 sidecar are always checked and swapped as a pair
+        with open(f"{pdf_path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            # Same quote payload as the PDF already on disk → skip the render
+            if os.path.exists(pdf_path) and os.path.exists(hash_path):
+                with open(hash_path, "r") as f:
+                    if f.read() == payload_hash:
+                        return f"{BASE_URL}/{quote_id}.pdf"
+
+            # Render and hash go to temp files and are swapped in atomically, so nothing half-written is ever read
+            html_out = template.render(**cleaned)
+            fd, tmp_path = tempfile.mkstemp(dir=STATIC_PDF_DIR, suffix=".pdf.tmp")
+            os.close(fd)
+            hash_fd, tmp_hash_path = tempfile.mkstemp(dir=STATIC_PDF_DIR, suffix=".sha256.tmp")
+            try:
+                with os.fdopen(hash_fd, "w") as f:
+                    f.write(payload_hash)
+                HTML(string=html_out).write_pdf(tmp_path)
+                if os.path.exists(hash_path):
+                    os.remove(hash_path)  # never leave an old hash pointing at a new PDF
+                os.replace(tmp_path, pdf_path)
+                os.replace(tmp_hash_path, hash_path)
+            finally:
+                for path in (tmp_path, tmp_hash_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+
         return f"{BASE_URL}/{quote_id}.pdf"
     except Exception as e:
         raise RuntimeError(f"PDF generation failed: {e}")
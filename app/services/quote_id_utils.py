@@ -1,19 +1,24 @@
 # === quote_id_utils.py ===
 
 import uuid
+import threading
+from collections import deque
 from datetime import datetime
 import pytz
-import requests
+import orjson
 
 from fastapi import HTTPException
-from app.config import logger, settings
+from app.config import logger
+from app.services.airtable_client import session, AIRTABLE_API_URL, AIRTABLE_TIMEOUT
 from app.utils.logging_utils import log_debug_event
 
 # Airtable Settings
-AIRTABLE_API_KEY = settings.AIRTABLE_API_KEY
-AIRTABLE_BASE_ID = settings.AIRTABLE_BASE_ID
 QUOTE_ID_COUNTER_TABLE = "Quote ID Counter"
 
+# Kept at 1 until the counter update is atomic: a larger block makes concurrent refills in
+# different workers claim the same range, and every restart throws the rest of a block away.
+QUOTE_ID_BLOCK_SIZE = 1
+
 # === Brendan Auto Quote ID (Chatbot Generated) ===
 def get_next_quote_id(prefix: str = "VC") -> str:
     """
@@ -36,21 +41,86 @@ def get_next_quote_id(prefix: str = "VC") -> str:
     return quote_id
 
 
+# === Admin Manual Quote ID Pool ===
+class QuoteIdPool:
+    """
+    Hands out sequential manual quote numbers from a block reserved in Airtable.
+    One refill bumps the Quote ID Counter by `size`, claiming that whole range for
+    this process, so Airtable is only called once per `size` quotes.
+
+    The refill is read-then-PATCH, not an atomic increment: two processes refilling
+    at the same moment read the same counter and hand out the same numbers.
+    """
+
+    def __init__(self, size: int = QUOTE_ID_BLOCK_SIZE):
+        self.size = size
+        self._ids = deque()
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            if not self._ids:
+                self._refill()
+            return self._ids.popleft()
+
+    def _refill(self):
+        url = f"{AIRTABLE_API_URL}/{QUOTE_ID_COUNTER_TABLE}"
+        record_id, start = _fetch_quote_id_counter(url)
+        end = start + self.size
+
+        try:
+            patch_res = session.patch(
+                f"{url}/{record_id}",
+                json={"fields": {"counter": end}},
+                timeout=AIRTABLE_TIMEOUT
+            )
+            if not patch_res.ok:
+                raise ValueError(patch_res.text)
+        except Exception as e:
+            logger.error(f"❌ Failed to reserve Quote ID block: {e}")
+            try:
+                log_debug_event(record_id, "BACKEND", "Quote ID Counter Update Failed", str(e))
+            except Exception:
+                pass
+            raise HTTPException(status_code=500, detail="Failed to update Quote ID Counter.")
+
+        self._ids.extend(range(start + 1, end + 1))
+        logger.info(f"✅ Reserved manual quote numbers {start + 1}–{end}")
+        try:
+            log_debug_event(record_id, "BACKEND", "Quote ID Block Reserved", f"{start + 1}–{end}")
+        except Exception:
+            pass
+
+
+_manual_quote_id_pool = QuoteIdPool()
+
+
 # === Admin Manual Quote ID (Sequential) ===
 def get_next_manual_quote_id() -> str:
     """
     Generates a sequential quote_id for admin-created quotes.
-    Pulls & increments counter in Airtable.
+    Numbers come from a block reserved in the Airtable counter (see QuoteIdPool).
     Format: VC-000123
     """
-    url = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{QUOTE_ID_COUNTER_TABLE}"
-    headers = {
-        "Authorization": f"Bearer {AIRTABLE_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    next_counter = _manual_quote_id_pool.next()
+    next_quote_id = f"VC-{next_counter:06d}"
+
+    logger.info(f"✅ Generated Manual quote_id: {next_quote_id}")
+    try:
+        log_debug_event(None, "BACKEND", "Manual Quote ID Generated", f"Manual quote_id: {next_quote_id}")
+    except Exception:
+        pass
+
+    return next_quote_id
+
 
+def _fetch_quote_id_counter(url: str) -> tuple:
+    """
+    Reads the Quote ID Counter record from Airtable.
+    Returns (record_id, counter).
+    """
     try:
-        res = requests.get(url, headers=headers)
+        res = session.get(url, params={"fields[]": "counter", "maxRecords": 1}, timeout=AIRTABLE_TIMEOUT)
         res.raise_for_status()
     except Exception as e:
         logger.error(f"❌ Failed to fetch Quote ID Counter: {e}")
@@ -60,7 +130,7 @@ def get_next_manual_quote_id() -> str:
             pass
         raise HTTPException(status_code=500, detail="Failed to fetch Quote ID Counter.")
 
-    records = res.json().get("records", [])
+    records = orjson.loads(res.content).get("records", [])
     if not records:
         logger.error("❌ No Quote ID Counter record found in Airtable.")
         try:
@@ -69,31 +139,4 @@ def get_next_manual_quote_id() -> str:
             pass
         raise HTTPException(status_code=500, detail="No Quote ID Counter record found.")
 
-    record_id = records[0]["id"]
-    current_counter = records[0]["fields"].get("counter", 0)
-    next_counter = current_counter + 1
-    next_quote_id = f"VC-{str(next_counter).zfill(6)}"
-
-    try:
-        patch_res = requests.patch(
-            f"{url}/{record_id}",
-            headers=headers,
-            json={"fields": {"counter": next_counter}}
-        )
-        if not patch_res.ok:
-            raise ValueError(patch_res.text)
-    except Exception as e:
-        logger.error(f"❌ Failed to update Quote ID Counter: {e}")
-        try:
-            log_debug_event(record_id, "BACKEND", "Quote ID Counter Update Failed", str(e))
-        except Exception:
-            pass
-        raise HTTPException(status_code=500, detail="Failed to update Quote ID Counter.")
-
-    logger.info(f"✅ Generated Manual quote_id: {next_quote_id}")
-    try:
-        log_debug_event(record_id, "BACKEND", "Manual Quote ID Generated", f"Manual quote_id: {next_quote_id}")
-    except Exception:
-        pass
-
-    return next_quote_id
+    return records[0]["id"], records[0]["fields"].get("counter", 0)
@@ -1,5 +1,27 @@
+from functools import lru_cache
+from operator import attrgetter
+from typing import Final
+
 from app.models.quote_models import QuoteRequest, QuoteResponse
-from app.config import logger
+from app.config import logger, pricing
+from app.utils.logging_utils import log_debug_event
+
+# === Pricing Constants (from PricingSettings) ===
+BASE_HOURLY_RATE: Final = pricing.BASE_HOURLY_RATE
+BASE_RATE_CENTS_PER_HOUR: Final = round(BASE_HOURLY_RATE * 100)
+SEASONAL_DISCOUNT_PERCENT: Final = pricing.SEASONAL_DISCOUNT_PERCENT
+PROPERTY_MANAGER_DISCOUNT: Final = pricing.PROPERTY_MANAGER_DISCOUNT
+GST_PERCENT: Final = pricing.GST_PERCENT
+
+WEEKEND_SURCHARGE_PERCENT: Final = pricing.WEEKEND_SURCHARGE_PERCENT
+AFTER_HOURS_SURCHARGE_PERCENT: Final = pricing.AFTER_HOURS_SURCHARGE_PERCENT
+MANDURAH_SURCHARGE_PERCENT: Final = pricing.MANDURAH_SURCHARGE_PERCENT
+
+# Combined discount percent, keyed by is_property_manager
+_DISCOUNT_PERCENT: Final = {
+    False: SEASONAL_DISCOUNT_PERCENT,
+    True: SEASONAL_DISCOUNT_PERCENT + PROPERTY_MANAGER_DISCOUNT,
+}
 
 REQUIRED_FIELDS_FOR_QUOTE = [
     "suburb", "bedrooms_v2", "bathrooms_v2", "furnished_status",
@@ -14,6 +36,34 @@ REQUIRED_FIELDS_FOR_QUOTE = [
     "quote_id"
 ]
 
+# === Per-Unit Service Minutes ===
+SERVICE_MINUTES: Final = {
+    "bedroom": 40,
+    "bathroom": 30,
+    "window": 10,
+    "blind": 10,
+    "furnished": 60,
+}
+
+# === Extra Service & Carpet Minute Tables (fixed order) ===
+EXTRA_SERVICE_TIMES: Final = {
+    "wall_cleaning": 30,
+    "balcony_cleaning": 20,
+    "deep_cleaning": 60,
+    "fridge_cleaning": pricing.FRIDGE_MINS,
+    "range_hood_cleaning": pricing.RANGE_HOOD_MINS,
+    "garage_cleaning": 40,
+    "oven_cleaning": 30,
+    "upholstery_cleaning": 45,
+}
+_EXTRA_ATTRS: Final = tuple(EXTRA_SERVICE_TIMES)
+_EXTRA_MINS: Final = tuple(EXTRA_SERVICE_TIMES.values())
+_EXTRA_GET: Final = attrgetter(*_EXTRA_ATTRS)
+
+_CARPET_KEYS: Final = ("carpet_mainroom_count", "carpet_stairs_count", "carpet_other_count")
+_CARPET_MINS: Final = (45, 35, 30)
+_CARPET_GET: Final = attrgetter(*_CARPET_KEYS)
+
 def should_calculate_quote(fields: dict) -> bool:
     missing = []
     for key in REQUIRED_FIELDS_FOR_QUOTE:
@@ -33,26 +83,6 @@ def should_calculate_quote(fields: dict) -> bool:
     return True
 
 def calculate_quote(data: QuoteRequest) -> QuoteResponse:
-    from app.utils.logging_utils import log_debug_event
-
-    BASE_HOURLY_RATE = 75.0
-    SEASONAL_DISCOUNT_PERCENT = 10
-    PROPERTY_MANAGER_DISCOUNT = 5
-    GST_PERCENT = 10
-
-    WEEKEND_SURCHARGE_PERCENT = 100
-    AFTER_HOURS_SURCHARGE_PERCENT = 15
-    MANDURAH_SURCHARGE_PERCENT = 30
-
-    EXTRA_SERVICE_TIMES = {
-        "wall_cleaning": 30,
-        "balcony_cleaning": 20,
-        "deep_cleaning": 60,
-        "fridge_cleaning": 30,
-        "range_hood_cleaning": 20,
-        "garage_cleaning": 40,
-    }
-
     record_id = getattr(data, "record_id", None)
     try:
         log_debug_event(record_id, "BACKEND", "Quote Calculation Started", f"quote_id: {data.quote_id}")
@@ -61,47 +91,38 @@ def calculate_quote(data: QuoteRequest) -> QuoteResponse:
 
     base_minutes = 0
     try:
-        base_minutes += (data.bedrooms_v2 or 0) * 40
-        base_minutes += (data.bathrooms_v2 or 0) * 30
+        base_minutes += (data.bedrooms_v2 or 0) * SERVICE_MINUTES["bedroom"]
+        base_minutes += (data.bathrooms_v2 or 0) * SERVICE_MINUTES["bathroom"]
         log_debug_event(record_id, "BACKEND", "Base Room Time", f"Bedrooms: {data.bedrooms_v2}, Bathrooms: {data.bathrooms_v2}")
 
-        for service, time in EXTRA_SERVICE_TIMES.items():
-            if getattr(data, service, False):
-                base_minutes += time
-                log_debug_event(record_id, "BACKEND", "Extra Service Time", f"{service}: +{time} mins")
+        flags = _EXTRA_GET(data)
+        extra_minutes = sum(mins for flag, mins in zip(flags, _EXTRA_MINS) if flag)
+        if extra_minutes:
+            selected = [service for flag, service in zip(flags, _EXTRA_ATTRS) if flag]
+            base_minutes += extra_minutes
+            log_debug_event(record_id, "BACKEND", "Extra Service Time", f"{', '.join(selected)}: +{extra_minutes} mins")
 
         if data.window_cleaning:
             wc = data.window_count or 0
-            base_minutes += wc * 10
-            log_debug_event(record_id, "BACKEND", "Window Cleaning Time", f"{wc} windows: +{wc * 10} mins")
+            window_mins = wc * SERVICE_MINUTES["window"]
+            base_minutes += window_mins
+            log_debug_event(record_id, "BACKEND", "Window Cleaning Time", f"{wc} windows: +{window_mins} mins")
 
             if data.blind_cleaning:
-                base_minutes += wc * 10
-                log_debug_event(record_id, "BACKEND", "Blind Cleaning Time", f"{wc} blinds: +{wc * 10} mins")
-
-        if data.oven_cleaning:
-            base_minutes += 30
-            log_debug_event(record_id, "BACKEND", "Oven Cleaning Time", "+30 mins")
-
-        if data.upholstery_cleaning:
-            base_minutes += 45
-            log_debug_event(record_id, "BACKEND", "Upholstery Cleaning Time", "+45 mins")
+                blind_mins = wc * SERVICE_MINUTES["blind"]
+                base_minutes += blind_mins
+                log_debug_event(record_id, "BACKEND", "Blind Cleaning Time", f"{wc} blinds: +{blind_mins} mins")
 
         if str(data.furnished_status).strip().lower() == "furnished":
-            base_minutes += 60
-            log_debug_event(record_id, "BACKEND", "Furnished Bonus Time", "+60 mins")
+            base_minutes += SERVICE_MINUTES["furnished"]
+            log_debug_event(record_id, "BACKEND", "Furnished Bonus Time", f"+{SERVICE_MINUTES['furnished']} mins")
 
         if str(data.carpet_cleaning).strip() == "Yes":
-            carpet_breakdown = {
-                "mainroom": (data.carpet_mainroom_count or 0) * 45,
-                "stairs": (data.carpet_stairs_count or 0) * 35,
-                "other": (data.carpet_other_count or 0) * 30
-            }
-
-            for area, mins in carpet_breakdown.items():
-                if mins > 0:
-                    log_debug_event(record_id, "BACKEND", f"Carpet {area.title()} Time", f"+{mins} mins")
-                base_minutes += mins
+            counts = tuple(count or 0 for count in _CARPET_GET(data))
+            carpet_minutes = sum(count * mins for count, mins in zip(counts, _CARPET_MINS))
+            if carpet_minutes:
+                log_debug_event(record_id, "BACKEND", "Carpet Time", f"Mainroom/Stairs/Other {counts}: +{carpet_minutes} mins")
+            base_minutes += carpet_minutes
 
         log_debug_event(record_id, "BACKEND", "Base Time Calculated", f"{base_minutes} mins")
 
@@ -110,44 +131,32 @@ def calculate_quote(data: QuoteRequest) -> QuoteResponse:
         log_debug_event(record_id, "BACKEND", "Calculation Error", f"Base time error: {e}")
         base_minutes = 0
 
-    min_total_mins = base_minutes
-    max_total_mins = base_minutes
-    is_range = False
-    note = None
-
-    if data.special_request_minutes_min is not None and data.special_request_minutes_max is not None:
-        min_total_mins += data.special_request_minutes_min
-        max_total_mins += data.special_request_minutes_max
-        is_range = True
-        note = f"Includes {data.special_request_minutes_min}–{data.special_request_minutes_max} min for special request"
-        log_debug_event(record_id, "BACKEND", "Special Request Time Added", f"{data.special_request_minutes_min}–{data.special_request_minutes_max} mins")
-
-    calculated_hours = round(max_total_mins / 60, 2)
-    base_price = round(calculated_hours * BASE_HOURLY_RATE, 2)
-
-    weekend_fee = round(base_price * WEEKEND_SURCHARGE_PERCENT / 100, 2) if data.weekend_cleaning else 0.0
-    after_hours_fee = round(base_price * AFTER_HOURS_SURCHARGE_PERCENT / 100, 2) if data.after_hours_cleaning else 0.0
-    mandurah_fee = round(base_price * MANDURAH_SURCHARGE_PERCENT / 100, 2) if data.mandurah_property else 0.0
+    smin = data.special_request_minutes_min or 0
+    smax = data.special_request_minutes_max or 0
+    is_range = data.special_request_minutes_min is not None and data.special_request_minutes_max is not None
+    min_total_mins = base_minutes + smin
+    max_total_mins = base_minutes + smax
+    note = f"Includes {smin}–{smax} min for special request" if is_range else None
+
+    if is_range:
+        log_debug_event(record_id, "BACKEND", "Special Request Time Added", f"{smin}–{smax} mins")
+
+    (
+        calculated_hours, weekend_fee, after_hours_fee, mandurah_fee,
+        total_discount_percent, discount_amount, discounted_price, gst_amount, total_with_gst
+    ) = _price_quote(
+        max_total_mins,
+        data.weekend_cleaning,
+        data.after_hours_cleaning,
+        data.mandurah_property,
+        data.is_property_manager,
+    )
 
     log_debug_event(record_id, "BACKEND", "Surcharges", f"Weekend: ${weekend_fee}, After-hours: ${after_hours_fee}, Mandurah: ${mandurah_fee}")
-
-    total_before_discount = base_price + weekend_fee + after_hours_fee + mandurah_fee
-
-    total_discount_percent = SEASONAL_DISCOUNT_PERCENT
-    if str(data.is_property_manager).strip().lower() in {"true", "yes", "1"}:
-        total_discount_percent += PROPERTY_MANAGER_DISCOUNT
-
-    discount_amount = round(total_before_discount * total_discount_percent / 100, 2)
-    discounted_price = round(total_before_discount - discount_amount, 2)
-
     log_debug_event(record_id, "BACKEND", "Discount Applied", f"{total_discount_percent}% = -${discount_amount:.2f}")
-
-    gst_amount = round(discounted_price * GST_PERCENT / 100, 2)
-    total_with_gst = round(discounted_price + gst_amount, 2)
-
     log_debug_event(record_id, "BACKEND", "Quote Total Calculated", f"${total_with_gst:.2f} incl GST")
 
-    return QuoteResponse(
+    return QuoteResponse.model_construct(
         quote_id=data.quote_id,
         estimated_time_mins=max_total_mins,
         minimum_time_mins=min_total_mins if is_range else None,
@@ -163,3 +172,38 @@ def calculate_quote(data: QuoteRequest) -> QuoteResponse:
         is_range=is_range,
         note=note
     )
+
+
+# === Pricing Core (pure arithmetic, memoized) ===
+
+@lru_cache(maxsize=1024)
+def _price_quote(total_mins: int, weekend: bool, after_hours: bool, mandurah: bool, is_property_manager: bool) -> tuple:
+    """
+    Pure pricing arithmetic — no I/O, logging, or model access.
+    Inputs are small ints/bools that repeat across quotes, so results are cached.
+    Returns (calculated_hours, weekend_fee, after_hours_fee, mandurah_fee,
+             discount_percent, discount_amount, discounted_price, gst_amount, total_with_gst).
+    """
+    calculated_hours = round(total_mins / 60, 2)
+
+    # All money is integer cents; percentages round half-up via (x * pct + 50) // 100
+    base_price = (total_mins * BASE_RATE_CENTS_PER_HOUR + 30) // 60
+
+    weekend_fee = (base_price * WEEKEND_SURCHARGE_PERCENT + 50) // 100 if weekend else 0
+    after_hours_fee = (base_price * AFTER_HOURS_SURCHARGE_PERCENT + 50) // 100 if after_hours else 0
+    mandurah_fee = (base_price * MANDURAH_SURCHARGE_PERCENT + 50) // 100 if mandurah else 0
+
+    total_before_discount = base_price + weekend_fee + after_hours_fee + mandurah_fee
+
+    total_discount_percent = _DISCOUNT_PERCENT[bool(is_property_manager)]
+
+    discount_amount = (total_before_discount * total_discount_percent + 50) // 100
+    discounted_price = total_before_discount - discount_amount
+
+    gst_amount = (discounted_price * GST_PERCENT + 50) // 100
+    total_with_gst = discounted_price + gst_amount
+
+    return (
+        calculated_hours, weekend_fee / 100, after_hours_fee / 100, mandurah_fee / 100,
+        total_discount_percent, discount_amount / 100, discounted_price / 100, gst_amount / 100, total_with_gst / 100
+    )
@@ -1,18 +1,25 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-import os
-import requests
+import asyncio
 
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+import httpx
+import orjson
+
+from app.config import logger
+from app.services.airtable_client import get_airtable_client, airtable_request
 from app.services.pdf_generator import generate_quote_pdf
 from app.services.email_sender import send_quote_email
 
 router = APIRouter()
 
 # --- Config ---
-AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
-AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
 AIRTABLE_TABLE_NAME = "Vacate Quotes"
 
+# --- Background Job Settings ---
+STORE_CUSTOMER_MAX_RETRIES = 3
+STORE_CUSTOMER_RETRY_BACKOFF = 2  # seconds, doubled on every retry
+
 # --- Data Model ---
 class CustomerData(BaseModel):
     mandurah_property: bool = False
@@ -21,7 +28,7 @@ class CustomerData(BaseModel):
     special_request_minutes_max: int = 0
 
     quote_id: str
-    name: str
+    name: str = Field(serialization_alias="customer_name")
     email: str
     phone: str
 
@@ -62,86 +69,143 @@ class CustomerData(BaseModel):
     message_log: str = ""
     session_id: str = ""
 
-def bool_to_checkbox(value: bool) -> str:
-    return "true" if value else "false"
-
-@router.post("/store-customer")
-async def store_customer(data: CustomerData):
+class AirtableBatcher:
+    """
+    Coalesces record creates into one POST of up to 10 records (Airtable's per-request cap).
+    Callers await their own record; a batch is sent when full or after `window` seconds.
+    """
+
+    def __init__(self, table_name: str, max_batch: int = 10, window: float = 0.1):
+        self.table_name = table_name
+        self.max_batch = max_batch
+        self.window = window
+        self._queue = asyncio.Queue()  # created once — restarting the worker must not orphan queued callers
+        self._worker = None
+        self._sending = set()  # in-flight batch tasks (strong refs so they aren't garbage-collected)
+
+    async def submit(self, client: httpx.AsyncClient, fields: dict) -> dict:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((client, fields, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            try:
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Already taken off the queue, so the next worker won't see them — fail them here
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Airtable batcher stopped before the record was sent"))
+                raise
+            # Sent concurrently — a batch stuck in 429 backoff doesn't hold up the ones behind it
+            task = asyncio.create_task(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: list):
+        client = batch[0][0]
+        try:
+            response = await airtable_request(
+                client,
+                "POST",
+                f"/{self.table_name}",
+                content=orjson.dumps({"records": [{"fields": fields} for _, fields, _ in batch]})
+            )
+
+            # 422 = one record's data was rejected, which fails the whole batch — retry each record
+            # on its own so only its caller sees the error. Any other 4xx (auth, permissions, wrong
+            # table) would fail every record the same way, so it fails the batch as is.
+            if response.status_code == 422 and len(batch) > 1:
+                logger.warning(f"⚠️ Airtable batch create failed ({response.status_code}) — retrying {len(batch)} record(s) individually")
+                await asyncio.gather(*(self._send([item]) for item in batch))
+                return
+
+            if response.status_code >= 300:  # 429/5xx were already retried by airtable_request
+                raise Exception(f"Airtable error: {response.text}")
+
+            records = orjson.loads(response.content).get("records", [])
+            for (_, _, future), record in zip(batch, records):
+                if not future.done():
+                    future.set_result(record)
+
+            missing = Exception(f"Airtable returned {len(records)} record(s) for a batch of {len(batch)}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(missing)
+
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+airtable_batcher = AirtableBatcher(AIRTABLE_TABLE_NAME)
+
+async def post_airtable_record(client: httpx.AsyncClient, fields: dict) -> dict:
+    return await airtable_batcher.submit(client, fields)
+
+async def with_retries(step, *args):
+    """
+    Runs one step, retrying network errors with exponential backoff.
+    HTTP error statuses aren't retried here — airtable_request already retries 429/5xx.
+    """
+    for attempt in range(STORE_CUSTOMER_MAX_RETRIES + 1):
+        try:
+            return await step(*args)
+        except httpx.TransportError as e:
+            if attempt == STORE_CUSTOMER_MAX_RETRIES:
+                raise
+            delay = STORE_CUSTOMER_RETRY_BACKOFF * (2 ** attempt)
+            logger.warning(f"⚠️ {step.__name__} attempt {attempt + 1} failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+
+async def send_quote_job(data: CustomerData, pdf_render: asyncio.Task):
+    """Email step, run by BackgroundTasks after the response has been sent."""
     try:
-        # === Prepare Airtable Payload ===
-        airtable_data = {
-            "quote_id": data.quote_id,
-            "customer_name": data.name,
-            "email": data.email,
-            "phone": data.phone,
-            "suburb": data.suburb,
-            "bedrooms_v2": data.bedrooms_v2,
-            "bathrooms_v2": data.bathrooms_v2,
-            "furnished": data.furnished,
-            "property_address": data.property_address,
-            "business_name": data.business_name,
-
-            "oven_cleaning": bool_to_checkbox(data.oven_cleaning),
-            "window_cleaning": bool_to_checkbox(data.window_cleaning),
-            "window_count": data.window_count,
-            "wall_cleaning": bool_to_checkbox(data.wall_cleaning),
-            "balcony_cleaning": bool_to_checkbox(data.balcony_cleaning),
-            "deep_cleaning": bool_to_checkbox(data.deep_cleaning),
-            "fridge_cleaning": bool_to_checkbox(data.fridge_cleaning),
-            "range_hood_cleaning": bool_to_checkbox(data.range_hood_cleaning),
-            "upholstery_cleaning": bool_to_checkbox(data.upholstery_cleaning),
-            "blind_cleaning": bool_to_checkbox(data.blind_cleaning),
-
-            "carpet_bedroom_count": data.carpet_bedroom_count,
-            "carpet_mainroom_count": data.carpet_mainroom_count,
-            "carpet_study_count": data.carpet_study_count,
-            "carpet_halway_count": data.carpet_halway_count,
-            "carpet_stairs_count": data.carpet_stairs_count,
-            "carpet_other_count": data.carpet_other_count,
-
-            "after_hours_cleaning": bool_to_checkbox(data.after_hours_cleaning),
-            "weekend_cleaning": bool_to_checkbox(data.weekend_cleaning),
-            "after_hours_surcharge": data.after_hours_surcharge,
-            "weekend_surcharge": data.weekend_surcharge,
-
-            "pdf_link": data.pdf_link,
-            "booking_url": data.booking_url,
-            "quote_stage": data.quote_stage,
-            "quote_notes": data.quote_notes,
-            "message_log": data.message_log,
-            "mandurah_property": bool_to_checkbox(data.mandurah_property),
-            "special_requests": data.special_requests,
-            "special_request_minutes_min": data.special_request_minutes_min,
-            "special_request_minutes_max": data.special_request_minutes_max,
-            "session_id": data.session_id,
-        }
-
-        headers = {
-            "Authorization": f"Bearer {AIRTABLE_API_KEY}",
-            "Content-Type": "application/json"
-        }
-
-        response = requests.post(
-            f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{AIRTABLE_TABLE_NAME}",
-            headers=headers,
-            json={"fields": airtable_data}
-        )
-
-        if response.status_code >= 300:
-            raise Exception(f"Airtable error: {response.text}")
-
-        # === Generate PDF Quote ===
-        pdf_path, _ = generate_quote_pdf(data.dict())
+        pdf_url = await pdf_render
 
         # === Send Quote via Outlook ===
-        send_quote_email(
+        await asyncio.to_thread(
+            send_quote_email,
             to_email=data.email,
             customer_name=data.name,
-            pdf_path=pdf_path,
+            pdf_url=pdf_url,
             quote_id=data.quote_id
         )
-
-        return {"status": "success", "quote_id": data.quote_id}
-
+        logger.info(f"✅ Quote emailed: {data.quote_id}")
+    except Exception as e:
+        logger.error(f"❌ Quote PDF/email failed for {data.quote_id}: {e}")
+
+@router.post("/store-customer", response_class=ORJSONResponse)
+async def store_customer(
+    data: CustomerData,
+    background: BackgroundTasks,
+    client: httpx.AsyncClient = Depends(get_airtable_client)
+):
+    # === Start the PDF render now so it overlaps the Airtable round-trip ===
+    pdf_render = asyncio.create_task(asyncio.to_thread(generate_quote_pdf, data.dict()))
+
+    # === Airtable write stays on the request (the client needs to know it's saved) ===
+    try:
+        await with_retries(post_airtable_record, client, data.model_dump(mode="json", by_alias=True))
     except Exception as e:
+        pdf_render.cancel()
         raise HTTPException(status_code=500, detail=str(e))
+
+    # === Email goes out after the response is flushed, once the PDF is ready ===
+    background.add_task(send_quote_job, data, pdf_render)
+
+    return {"status": "success", "quote_id": data.quote_id}
@@ -1,146 +1,244 @@
-import json
+import orjson
+import time
+import queue
+import atexit
 import logging
-import requests
-from datetime import datetime
-from app.config import settings
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+from app.config import settings, TABLE_NAME
+from app.services.airtable_client import session, airtable_breaker, AIRTABLE_API_URL, AIRTABLE_TIMEOUT
 from app.api.field_rules import VALID_AIRTABLE_FIELDS, FIELD_MAP, BOOLEAN_FIELDS, INTEGER_FIELDS, TRUE_VALUES, MAX_REASONABLE_INT
 
-TABLE_NAME = "Vacate Quotes"
-MAX_LOG_LENGTH = 10000
-_log_cache = {}
+TABLE_URL = f"{AIRTABLE_API_URL}/{quote(TABLE_NAME)}"  # auth + JSON headers live on the shared session
+RECORD_URL_PREFIX = TABLE_URL + "/"  # + record_id
+AIRTABLE_BATCH_SIZE = 10  # max records per Airtable create/update request
+FALLBACK_WORKERS = 5
+DEBUG_LOG_MAX_LINES = 1500  # per record, oldest dropped first
+FLUSH_WINDOW = 0.1  # seconds the background flusher waits to fill a batch
+DEBUG_LOG_MAX_RECORDS = 2048  # records buffered at once, least recently logged evicted first
+DEBUG_LOG_TTL = 3600  # seconds — a record's buffer is dropped if nothing flushes it in time
+_log_cache = OrderedDict()  # record_id -> [last_logged_at, deque of lines], oldest first
+_log_cache_lock = threading.Lock()
 logger = logging.getLogger(__name__)
+_DEBUG_ENABLED = settings.LOG_LEVEL.upper() == "DEBUG"  # off → debug events are never built or buffered
+
+
+class _RateLimiter:
+    """Spaces calls across threads so no more than `rate` start per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start_at = max(now, self.next_at)
+            self.next_at = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+_airtable_rate = _RateLimiter(5)  # Airtable: 5 requests/sec per base
+
+
+_ts_cache = (0, "")
+
+
+def _utc_timestamp() -> str:
+    """ISO timestamp at second granularity, formatted once per second instead of per event."""
+    global _ts_cache
+    now = int(time.time())
+    cached = _ts_cache
+    if cached[0] != now:
+        cached = _ts_cache = (now, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)))
+    return cached[1]
 
 
 def log_debug_event(record_id: str = None, source: str = "BACKEND", label: str = "", message: str = "", session_id: str = None):
-    timestamp = datetime.utcnow().isoformat()
+    if not _DEBUG_ENABLED:
+        return
+
+    # No record to buffer against → console only, and only when DEBUG is on
+    if not record_id and not logger.isEnabledFor(logging.DEBUG):
+        return
+
+    timestamp = _utc_timestamp()
     tag = f"[{timestamp}] [{source}] {label}: {message}"
     if session_id:
         tag = f"[session_id={session_id}] {tag}"
 
     if not record_id:
-        print(f"📄 Debug (no record_id): {tag}")
+        logger.debug(f"📄 Debug (no record_id): {tag[:512]}")
         return
 
-    if record_id not in _log_cache:
-        _log_cache[record_id] = []
-
-    _log_cache[record_id].append(tag)
+    # Buffered in memory only — written to Airtable with the record's next update.
+    # Bounded per record (newest lines kept) and in record count (LRU + TTL).
+    now = time.monotonic()
+    with _log_cache_lock:
+        entry = _log_cache.get(record_id)
+        if entry is None:
+            entry = _log_cache[record_id] = [now, deque(maxlen=DEBUG_LOG_MAX_LINES)]
+        else:
+            entry[0] = now
+            _log_cache.move_to_end(record_id)
+        entry[1].append(tag)
+
+        # Least recently logged sit at the front — evict them while over capacity or expired
+        while _log_cache:
+            oldest_id, (logged_at, _) = next(iter(_log_cache.items()))
+            if len(_log_cache) <= DEBUG_LOG_MAX_RECORDS and now - logged_at < DEBUG_LOG_TTL:
+                break
+            _log_cache.popitem(last=False)
+            logger.debug(f"🧹 Debug log buffer evicted for {oldest_id}")
 
 
 def flush_debug_log(record_id: str, session_id: str = None):
+    """
+    Drains the buffered debug lines for a record and returns them as one string.
+    Callers write it in the same PATCH as their field update (no separate request).
+    """
     if not record_id:
         return ""
 
-    logs = _log_cache.get(record_id, [])
-    if not logs:
+    # pop() takes the whole buffer in one step — lines logged mid-flush land in a fresh one
+    with _log_cache_lock:
+        entry = _log_cache.pop(record_id, None)
+    if entry and time.monotonic() - entry[0] >= DEBUG_LOG_TTL:
+        entry = None
+    combined = "\n".join(entry[1]).strip() if entry else ""
+    if not combined:
         return ""
 
-    combined = "\n".join(logs).strip()
-    _log_cache[record_id] = []
+    line_count = combined.count("\n") + 1
+    # Console only — logging this into the buffer would re-seed it, so every later
+    # update would carry a debug_log containing nothing but this line
+    logger.debug(f"📄 Debug log flushed for {record_id}: {len(combined)} chars ({line_count} lines)")
 
-    line_count = len(combined.splitlines())
-    log_debug_event(record_id, "BACKEND", "Debug Log Flushed", f"{len(combined)} chars flushed to Airtable ({line_count} lines)", session_id=session_id)
+    return combined
 
-    try:
-        url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{TABLE_NAME}/{record_id}"
-        headers = {
-            "Authorization": f"Bearer {settings.AIRTABLE_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        payload = {"fields": {"debug_log": combined}}
-
-        res = requests.patch(url, headers=headers, json=payload)
-        res.raise_for_status()
-
-        logger.info(f"✅ Debug log successfully flushed for record {record_id}")
-        return combined
-    except Exception as e:
-        logger.error(f"❌ Error flushing debug log to Airtable for record {record_id}: {e}")
-        log_debug_event(record_id, "BACKEND", "Debug Log Flush Error", str(e), session_id=session_id)
-        return combined
 
+# === Per-Field Normalizers (looked up once per field instead of walking an if/elif chain) ===
+FLOAT_FIELDS = frozenset({
+    "gst_applied", "total_price", "base_hourly_rate", "price_per_session",
+    "estimated_time_mins", "discount_applied", "mandurah_surcharge",
+    "after_hours_surcharge", "weekend_surcharge", "calculated_hours"
+})
+NO_SPECIAL_REQUESTS = frozenset({"no", "none", "false", "no special requests", "n/a"})
+LOG_FIELDS = frozenset({"debug_log", "message_log"})  # long text — traced by length, never by value
+CARPET_CLEANING_OPTIONS = frozenset({"Yes", "No"})
 
-def update_quote_record(record_id: str, fields: dict):
-    log_debug_event(record_id, "BACKEND", "Function Start", f"update_quote_record(record_id={record_id}, fields={list(fields.keys())})")
 
-    if not record_id:
-        logger.warning("⚠️ update_quote_record called with no record_id")
-        return []
+# Common boolean inputs resolved with one dict lookup (no str/strip/lower allocation).
+# Only bool/str/None take the fast path — 1.0 hashes like True but must still go the slow way.
+_MISSING = object()
+_FAST_BOOL_TYPES = frozenset({bool, str, type(None)})
+_FAST_BOOL = {
+    True: True, False: False, None: False, "": False,
+    "true": True, "True": True, "TRUE": True, "yes": True, "Yes": True, "YES": True, "1": True,
+    "false": False, "False": False, "FALSE": False, "no": False, "No": False, "NO": False, "0": False,
+}
 
-    session_id = fields.get("session_id", "UNKNOWN")
 
-    url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{TABLE_NAME}/{record_id}"
-    headers = {
-        "Authorization": f"Bearer {settings.AIRTABLE_API_KEY}",
-        "Content-Type": "application/json"
-    }
+def _passthrough(value):
+    return value  # numeric strings are cast server-side (typecast: true)
+
+
+def _norm_customer_name(value):
+    return value.strip()
+
+
+def _norm_special_requests(value):
+    if not value or str(value).strip().lower() in NO_SPECIAL_REQUESTS:
+        return ""
+    return str(value).strip()
+
+
+def _norm_extra_hours(value):
+    return float(value) if value not in [None, ""] else 0.0
+
+
+def _norm_furnished(value):
+    val = str(value).strip().lower()
+    if "unfurnished" in val:
+        return "Unfurnished"
+    if "furnished" in val:
+        return "Furnished"
+    return ""
+
+
+def _norm_carpet_cleaning(value):
+    val = str(value).strip().capitalize()
+    return val if val in CARPET_CLEANING_OPTIONS else ""
+
+
+_NORMALIZERS = {
+    **dict.fromkeys(FLOAT_FIELDS, _passthrough),
+    "customer_name": _norm_customer_name,
+    "special_requests": _norm_special_requests,
+    "extra_hours_requested": _norm_extra_hours,
+    "furnished": _norm_furnished,
+    "carpet_cleaning": _norm_carpet_cleaning,
+}
+
+
+def _normalize_fields(record_id: str, fields: dict) -> dict:
+    """
+    Maps, validates and type-normalizes one record's fields for Airtable.
+    Attaches the record's buffered debug_log. Returns {} if nothing is left to write.
+    """
+    session_id = fields.get("session_id", "UNKNOWN")
 
     normalized_fields = {}
 
+    # Loop-invariant lookups bound to locals (LOAD_FAST instead of LOAD_GLOBAL + attribute per field)
+    field_map_get = FIELD_MAP.get
+    normalizer_get = _NORMALIZERS.get
+    fast_bool_get = _FAST_BOOL.get
+    is_valid = VALID_AIRTABLE_FIELDS.__contains__
+    is_bool = BOOLEAN_FIELDS.__contains__
+    is_int = INTEGER_FIELDS.__contains__
+    debug_enabled = _DEBUG_ENABLED
+
     for raw_key, value in fields.items():
-        key = FIELD_MAP.get(raw_key, raw_key)
-        log_debug_event(record_id, "BACKEND", "Raw Field Input", f"{raw_key} → {key} = {value}", session_id=session_id)
+        key = field_map_get(raw_key, raw_key)
+        if debug_enabled:
+            shown = f"<{len(str(value))} chars>" if key in LOG_FIELDS else value
+            log_debug_event(record_id, "BACKEND", "Raw Field Input", f"{raw_key} → {key} = {shown}", session_id=session_id)
 
-        if key not in VALID_AIRTABLE_FIELDS:
+        if not is_valid(key):
             logger.warning(f"⚠️ Skipping unknown Airtable field: {key}")
-            log_debug_event(record_id, "BACKEND", "Field Skipped", f"{key} not in VALID_AIRTABLE_FIELDS", session_id=session_id)
+            if debug_enabled:
+                log_debug_event(record_id, "BACKEND", "Field Skipped", f"{key} not in VALID_AIRTABLE_FIELDS", session_id=session_id)
             continue
 
         try:
-            if key == "customer_name":
-                if value and not fields.get("customer_name", "").strip():
-                    value = str(value).strip()
-                    log_debug_event(record_id, "BACKEND", "Customer Name Captured", f"Stored customer name: {value}", session_id=session_id)
-                else:
-                    value = fields.get("customer_name", "").strip()
-
-            if key in BOOLEAN_FIELDS:
-                if isinstance(value, bool):
-                    pass
-                elif value in [None, ""]:
-                    value = False
+            normalize = normalizer_get(key)
+            if normalize:
+                value = normalize(value)
+
+            elif is_bool(key):
+                fast = fast_bool_get(value, _MISSING) if type(value) in _FAST_BOOL_TYPES else _MISSING
+                if fast is not _MISSING:
+                    value = fast
                 else:
                     original = value
                     value = str(value).strip().lower() in TRUE_VALUES
-                    log_debug_event(record_id, "BACKEND", "Bool Normalized", f"{key}: {original} → {value}", session_id=session_id)
+                    if debug_enabled:
+                        log_debug_event(record_id, "BACKEND", "Bool Normalized", f"{key}: {original} → {value}", session_id=session_id)
 
-            elif key in INTEGER_FIELDS:
+            elif is_int(key):
                 original = value
                 value = int(float(value))
                 if value > MAX_REASONABLE_INT:
                     logger.warning(f"⚠️ Clamping large value for {key}: {value}")
-                    log_debug_event(record_id, "BACKEND", "Int Clamped", f"{key}: {original} → {MAX_REASONABLE_INT}", session_id=session_id)
+                    if debug_enabled:
+                        log_debug_event(record_id, "BACKEND", "Int Clamped", f"{key}: {original} → {MAX_REASONABLE_INT}", session_id=session_id)
                     value = MAX_REASONABLE_INT
 
-            elif key in {
-                "gst_applied", "total_price", "base_hourly_rate", "price_per_session",
-                "estimated_time_mins", "discount_applied", "mandurah_surcharge",
-                "after_hours_surcharge", "weekend_surcharge", "calculated_hours"
-            }:
-                value = float(value)
-
-            elif key == "special_requests":
-                if not value or str(value).strip().lower() in {"no", "none", "false", "no special requests", "n/a"}:
-                    value = ""
-                else:
-                    value = str(value).strip()
-
-            elif key == "extra_hours_requested":
-                value = float(value) if value not in [None, ""] else 0.0
-
-            elif key == "furnished":
-                val = str(value).strip().lower()
-                if "unfurnished" in val:
-                    value = "Unfurnished"
-                elif "furnished" in val:
-                    value = "Furnished"
-                else:
-                    value = ""
-
-            elif key == "carpet_cleaning":
-                val = str(value).strip().capitalize()
-                value = val if val in {"Yes", "No"} else ""
-
             else:
                 value = "" if value is None else str(value).strip()
 
@@ -153,52 +251,40 @@ def update_quote_record(record_id: str, fields: dict):
 
     debug_log = flush_debug_log(record_id, session_id=session_id)
     if debug_log:
-        normalized_fields["debug_log"] = debug_log
-        log_debug_event(record_id, "BACKEND", "Debug Log Flushed", f"{len(debug_log)} chars flushed to Airtable", session_id=session_id)
+        # Queued debug_log flushes arrive with their own lines — append rather than overwrite them
+        passed = normalized_fields.get("debug_log")
+        normalized_fields["debug_log"] = f"{passed}\n{debug_log}" if passed else debug_log
 
     if not normalized_fields:
         logger.info(f"⏩ No valid fields to update for record {record_id}")
         log_debug_event(record_id, "BACKEND", "Update Skipped", "No valid fields to apply.", session_id=session_id)
-        return []
 
-    logger.info(f"\n📤 Updating Airtable Record: {record_id}")
-    logger.info(f"🛠 Payload: {json.dumps(normalized_fields, indent=2)}")
+    return normalized_fields
 
-    for key in list(normalized_fields.keys()):
-        if key not in VALID_AIRTABLE_FIELDS:
-            logger.error(f"❌ INVALID FIELD DETECTED: {key} — Removing from payload.")
-            log_debug_event(record_id, "BACKEND", "Invalid Field Detected", key, session_id=session_id)
-            normalized_fields.pop(key, None)
 
-    try:
-        res = requests.patch(url, headers=headers, json={"fields": normalized_fields})
-        if res.ok:
-            logger.info("✅ Airtable bulk update success.")
-            log_debug_event(record_id, "BACKEND", "Record Updated (Bulk)", f"Fields updated: {list(normalized_fields.keys())}", session_id=session_id)
-            return list(normalized_fields.keys())
+def _patch_single_field(url: str, key: str, value):
+    _airtable_rate.wait()
+    return session.patch(url, timeout=AIRTABLE_TIMEOUT, data=orjson.dumps({"fields": {key: value}, "typecast": True}))
 
-        logger.error(f"❌ Airtable bulk update failed: {res.status_code}")
-        try:
-            logger.error(f"🧾 Error response: {res.json()}")
-        except Exception:
-            logger.error("🧾 Error response: (Non-JSON)")
 
-    except Exception as e:
-        logger.error(f"❌ Exception during Airtable bulk update: {e}")
-        log_debug_event(record_id, "BACKEND", "Bulk Update Exception", str(e), session_id=session_id)
+def _patch_fields_one_by_one(record_id: str, fields: dict, session_id: str) -> list:
+    url = RECORD_URL_PREFIX + record_id
 
+    # Independent PATCHes — run them in parallel, paced to Airtable's 5 req/s
     successful = []
-    for key, value in normalized_fields.items():
-        try:
-            single_res = requests.patch(url, headers=headers, json={"fields": {key: value}})
-            if single_res.ok:
-                logger.info(f"✅ Field '{key}' updated successfully.")
-                successful.append(key)
-            else:
-                logger.error(f"❌ Field '{key}' failed to update.")
-        except Exception as e:
-            logger.error(f"❌ Exception updating field '{key}': {e}")
-            log_debug_event(record_id, "BACKEND", "Fallback Field Update Error", f"{key}: {e}", session_id=session_id)
+    with ThreadPoolExecutor(max_workers=FALLBACK_WORKERS) as pool:
+        futures = {pool.submit(_patch_single_field, url, key, value): key for key, value in fields.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                if future.result().ok:
+                    logger.info(f"✅ Field '{key}' updated successfully.")
+                    successful.append(key)
+                else:
+                    logger.error(f"❌ Field '{key}' failed to update.")
+            except Exception as e:
+                logger.error(f"❌ Exception updating field '{key}': {e}")
+                log_debug_event(record_id, "BACKEND", "Fallback Field Update Error", f"{key}: {e}", session_id=session_id)
 
     if successful:
         log_debug_event(record_id, "BACKEND", "Record Updated (Fallback)", f"Fields updated one-by-one: {successful}", session_id=session_id)
@@ -206,3 +292,172 @@ def update_quote_record(record_id: str, fields: dict):
         log_debug_event(record_id, "BACKEND", "Update Failed", "No fields could be updated (bulk and fallback both failed).", session_id=session_id)
 
     return successful
+
+
+def _update_single_record(record_id: str, fields: dict, session_id: str) -> list:
+    url = RECORD_URL_PREFIX + record_id
+
+    if not airtable_breaker.before():
+        logger.warning(f"⚠️ Airtable circuit open — skipping update for {record_id}")
+        return []
+
+    try:
+        res = session.patch(url, timeout=AIRTABLE_TIMEOUT, data=orjson.dumps({"fields": fields, "typecast": True}))
+        airtable_breaker.record_response(res)
+        if res.ok:
+            log_debug_event(record_id, "BACKEND", "Record Updated (Single)", f"Fields updated: {list(fields.keys())}", session_id=session_id)
+            return list(fields.keys())
+        logger.error(f"❌ Airtable update failed for {record_id}: {res.status_code}")
+    except Exception as e:
+        airtable_breaker.record_failure()
+        logger.error(f"❌ Exception during Airtable update for {record_id}: {e}")
+        log_debug_event(record_id, "BACKEND", "Single Update Exception", str(e), session_id=session_id)
+        return []
+
+    # Only a rejected field (422) is worth isolating — 429/5xx were already retried by the session
+    if res.status_code != 422:
+        return []
+    return _patch_fields_one_by_one(record_id, fields, session_id)
+
+
+def bulk_update_quote_records(updates: list) -> dict:
+    """
+    Updates many records with one PATCH per 10 (Airtable's batch limit).
+    updates: [(record_id, fields), ...] → {record_id: [updated field names]}
+    Several updates to the same record are merged into one entry: later values win,
+    except debug_log/message_log chunks, which are appended in order.
+    """
+    merged = {}
+    for record_id, fields in updates:
+        if record_id not in merged:
+            merged[record_id] = dict(fields)
+            continue
+        entry = merged[record_id]
+        for key, value in fields.items():
+            if key in LOG_FIELDS and entry.get(key) and value:
+                entry[key] = f"{entry[key]}\n{value}"
+            else:
+                entry[key] = value
+
+    prepared = []
+    for record_id, fields in merged.items():
+        log_debug_event(record_id, "BACKEND", "Function Start", f"update_quote_record(record_id={record_id}, fields={list(fields.keys())})")
+        if not record_id:
+            logger.warning("⚠️ update_quote_record called with no record_id")
+            continue
+
+        normalized_fields = _normalize_fields(record_id, fields)
+        if normalized_fields:
+            prepared.append((record_id, normalized_fields, fields.get("session_id", "UNKNOWN")))
+
+    url = TABLE_URL
+
+    updated = {}
+    for i in range(0, len(prepared), AIRTABLE_BATCH_SIZE):
+        chunk = prepared[i:i + AIRTABLE_BATCH_SIZE]
+        records = [{"id": record_id, "fields": fields} for record_id, fields, _ in chunk]
+
+        if not airtable_breaker.before():
+            logger.warning(f"⚠️ Airtable circuit open — skipping update for {[r['id'] for r in records]}")
+            continue
+
+        logger.info(f"\n📤 Updating {len(chunk)} Airtable record(s): {[r['id'] for r in records]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🛠 Payload: %s", orjson.dumps(records).decode())
+
+        try:
+            res = session.patch(url, timeout=AIRTABLE_TIMEOUT, data=orjson.dumps({"records": records, "typecast": True}))
+            airtable_breaker.record_response(res)
+            if res.ok:
+                logger.info("✅ Airtable bulk update success.")
+                for record_id, fields, session_id in chunk:
+                    updated[record_id] = list(fields.keys())
+                    log_debug_event(record_id, "BACKEND", "Record Updated (Bulk)", f"Fields updated: {updated[record_id]}", session_id=session_id)
+                continue
+
+            logger.error(f"❌ Airtable bulk update failed: {res.status_code}")
+            try:
+                logger.error(f"🧾 Error response: {res.json()}")
+            except Exception:
+                logger.error("🧾 Error response: (Non-JSON)")
+
+            # 429/5xx were already retried by the session — splitting the batch would only add load
+            if res.status_code != 422:
+                continue
+
+        except Exception as e:
+            airtable_breaker.record_failure()
+            logger.error(f"❌ Exception during Airtable bulk update: {e}")
+            for record_id, _, session_id in chunk:
+                log_debug_event(record_id, "BACKEND", "Bulk Update Exception", str(e), session_id=session_id)
+            continue
+
+        # One bad record fails the whole batch — retry record-by-record (field-by-field if it was alone)
+        for record_id, fields, session_id in chunk:
+            if len(chunk) == 1:
+                updated[record_id] = _patch_fields_one_by_one(record_id, fields, session_id)
+            else:
+                updated[record_id] = _update_single_record(record_id, fields, session_id)
+
+    return updated
+
+
+def update_quote_record(record_id: str, fields: dict):
+    return bulk_update_quote_records([(record_id, fields)]).get(record_id, [])
+
+
+# === Background Update Flusher ===
+# queue_quote_update() returns immediately; a daemon thread batches queued updates
+# (up to 10 records or FLUSH_WINDOW seconds) into bulk PATCHes off the request path.
+_update_queue = queue.Queue()
+_flusher_thread = None
+_flusher_lock = threading.Lock()
+
+
+def _drain_batch(first) -> list:
+    batch = [first]
+    deadline = time.monotonic() + FLUSH_WINDOW
+    while len(batch) < AIRTABLE_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_update_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _flusher():
+    while True:
+        batch = _drain_batch(_update_queue.get())
+        try:
+            bulk_update_quote_records(batch)
+        except Exception as e:
+            logger.error(f"❌ Background Airtable flush failed for {len(batch)} record(s): {e}")
+        finally:
+            for _ in batch:
+                _update_queue.task_done()
+
+
+def start_flusher():
+    global _flusher_thread
+    with _flusher_lock:
+        if _flusher_thread is None or not _flusher_thread.is_alive():
+            _flusher_thread = threading.Thread(target=_flusher, name="airtable-flusher", daemon=True)
+            _flusher_thread.start()
+
+
+def drain_update_queue():
+    """Blocks until every queued update has been sent (used on shutdown)."""
+    if _flusher_thread is not None and _flusher_thread.is_alive():
+        _update_queue.join()
+
+
+def queue_quote_update(record_id: str, fields: dict):
+    """Non-blocking update_quote_record: the PATCH happens on the background flusher."""
+    start_flusher()
+    _update_queue.put((record_id, fields))
+
+
+atexit.register(drain_update_queue)
@@ -0,0 +1,14 @@
+# === Gunicorn Worker ===
+# gunicorn builds uvicorn's Config from CONFIG_KWARGS plus its own settings, so uvicorn-only
+# options (like limit_concurrency) have to be set here rather than in gunicorn.conf.py.
+
+from uvicorn.workers import UvicornWorker
+
+from app.config import get_settings
+
+
+class BrendanUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "limit_concurrency": get_settings().UVICORN_LIMIT_CONCURRENCY,
+    }
@@ -0,0 +1,15 @@
+# === gunicorn.conf.py ===
+# Production entrypoint: gunicorn -c gunicorn.conf.py run:app
+# The app is imported once in the master and forked, so settings, templates and other
+# import-time state are shared copy-on-write across workers. Anything that opens sockets,
+# threads or event loops (Airtable client, update flusher) starts per worker in the lifespan.
+
+from app.config import get_settings
+
+bind = "0.0.0.0:10000"
+worker_class = "app.workers.BrendanUvicornWorker"  # UvicornWorker + limit_concurrency
+workers = get_settings().WEB_CONCURRENCY  # same source (env or .env) as run.py
+preload_app = True
+accesslog = None
+backlog = 2048
+keepalive = 5  # seconds, passed to uvicorn's timeout_keep_alive
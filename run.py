@@ -1,106 +1,31 @@
 # === Imports ===
 import logging
-import os
-from dotenv import load_dotenv
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
-from openai import OpenAI
+from app.config import get_settings
+from app.factory import create_app
 from app.utils.logging_utils import log_debug_event
-from app.api.quote import router as quote_router
-from app.api.filter_response import router as filter_response_router
-from app.store_customer import router as store_customer_router
-from app import auto_fixer  # ✅ AI Auto-Fix Commit System
-
-# === Load environment variables ===
-load_dotenv()
-
-# === Load API Keys ===
-api_key = os.getenv("OPENAI_API_KEY")
-airtable_key = os.getenv("AIRTABLE_API_KEY")
-airtable_base = os.getenv("AIRTABLE_BASE_ID")
-
-# === Set logging config for full stdout/stderr capture ===
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
 
+settings = get_settings()
 logger = logging.getLogger("BrendanStartup")
 
-# === Key Load Debug Logging ===
-try:
-    if api_key:
-        logger.info(f"✅ Loaded OpenAI Key: {api_key}")
-        log_debug_event(None, "LOCAL", "OpenAI Key Loaded", f"Key = {api_key}")
-    else:
-        logger.error("❌ ERROR: OPENAI_API_KEY not loaded!")
-        log_debug_event(None, "LOCAL", "OpenAI Key Error", "OPENAI_API_KEY not found in .env")
-except Exception as e:
-    logger.warning(f"⚠️ Error logging OpenAI key load: {e}")
-
-try:
-    if airtable_key and airtable_base:
-        logger.info(f"✅ Airtable Key: {airtable_key}")
-        logger.info(f"✅ Airtable Base ID: {airtable_base}")
-        log_debug_event(None, "LOCAL", "Airtable Credentials Loaded", f"Key = {airtable_key}, Base = {airtable_base}")
-    else:
-        logger.error("❌ ERROR: Airtable credentials not loaded! Check .env.")
-        log_debug_event(None, "LOCAL", "Airtable Credentials Error", "Missing airtable_key or base")
-except Exception as e:
-    logger.warning(f"⚠️ Error logging Airtable credential load: {e}")
-
-# === OpenAI Client ===
-client = OpenAI(api_key=api_key)
-
 # === FastAPI App ===
-app = FastAPI(
-    title="Brendan API",
-    description="Backend for Orca Cleaning's AI Quote Assistant - Brendan",
-    version="1.0.0"
-)
-
-# === CORS ===
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# === Routers ===
-app.include_router(filter_response_router)
-app.include_router(quote_router)
-app.include_router(store_customer_router)
-app.include_router(auto_fixer.router)
+# Run directly, this module only renders the test PDF and hands "run:app" to uvicorn,
+# which re-imports it as `run` — so the routers are only loaded where they're served.
+app = create_app(include_routers=__name__ != "__main__")
 
-# === Root Endpoint ===
-@app.get("/")
-def read_root():
-    try:
-        log_debug_event(None, "LOCAL", "Ping Root", "Root endpoint accessed")
-    except Exception as e:
-        logger.warning(f"⚠️ Error logging root ping: {e}")
-    return JSONResponse(content={"message": "Welcome to Brendan Backend! 🎉"})
+# === Run ===
+if __name__ == "__main__":
+    from app.services.pdf_generator import generate_quote_pdf  # only the test render needs it here
 
-# === Health Check ===
-@app.get("/ping")
-def ping():
+    # === Optional: Test PDF Gen (data built once, only when run directly) ===
     try:
-        log_debug_event(None, "LOCAL", "Ping /ping", "Health check requested")
-    except Exception as e:
-        logger.warning(f"⚠️ Error logging ping: {e}")
-    return {"ping": "pong"}
+        with open("app/static/orca_logo.b64.txt", "r", encoding="utf-8") as f:
+            logo_b64 = f.read()
+    except FileNotFoundError:
+        logger.warning("⚠️ orca_logo.b64.txt not found — test PDF will render without a logo")
+        logo_b64 = ""
 
-# === Optional: Test PDF Gen ===
-from app.services.pdf_generator import generate_quote_pdf
-def get_test_pdf_data():
-    return {
+    TEST_PDF_DATA = {
         "quote_id": "VAC-LOGOTEST01",
         "suburb": "Subiaco",
         "customer_name": "John Smith",
@@ -139,15 +64,12 @@ def get_test_pdf_data():
         "gst_amount": 41.46,
         "final_price": 456.05,
         "quote_notes": "Includes 30–60 min for special request",
-        "logo_base64": open("app/static/orca_logo.b64.txt", "r").read(),
+        "logo_base64": logo_b64,
     }
 
-# === Run ===
-if __name__ == "__main__":
     try:
         log_debug_event(None, "LOCAL", "Test Mode", "Attempting PDF generation...")
-        data = get_test_pdf_data()
-        path = generate_quote_pdf(data)
+        path = generate_quote_pdf(TEST_PDF_DATA)
         print(f"✅ PDF generated at: {path}")
         log_debug_event(None, "LOCAL", "PDF Generation Successful", path)
     except Exception as e:
@@ -157,12 +79,20 @@ if __name__ == "__main__":
         except Exception as fallback:
             print(f"⚠️ Fallback logging failed: {fallback}")
 
+    # ENV=dev → auto-reload + access log; anything else runs the production config
     import uvicorn
+    is_dev = settings.ENV == "dev"
     uvicorn.run(
         "run:app",
         host="0.0.0.0",
         port=10000,
-        reload=True,
-        access_log=True,
-        log_level="debug"
+        workers=None if is_dev else settings.WEB_CONCURRENCY,
+        loop="auto" if is_dev else "uvloop",
+        http="auto" if is_dev else "httptools",
+        reload=is_dev,
+        access_log=is_dev,
+        backlog=2048,
+        limit_concurrency=None if is_dev else settings.UVICORN_LIMIT_CONCURRENCY,
+        timeout_keep_alive=5,
+        log_level=settings.LOG_LEVEL.lower() if "LOG_LEVEL" in settings.model_fields_set else ("debug" if is_dev else "info")
     )